@@ -7,10 +7,10 @@ from typing import Dict, Any, List, Optional, Set
 from datetime import datetime
 from pathlib import Path
 from langchain.agents import AgentExecutor, create_openai_functions_agent
-from langchain_openai import ChatOpenAI
 from langchain.prompts import ChatPromptTemplate, MessagesPlaceholder
 from langchain.tools import BaseTool
 from config import Config
+from agents.llm_client import get_llm
 from utils.logging_config import setup_logging
 import re
 
@@ -45,10 +45,21 @@ class DynamicDatabaseTool(BaseTool):
                         completeness_score REAL,
                         raw_data TEXT,
                         processed_data TEXT,
-                        created_at TEXT DEFAULT CURRENT_TIMESTAMP
+                        created_at TEXT DEFAULT CURRENT_TIMESTAMP,
+                        content_hash TEXT
                     )
                 ''')
                 
+                # Databases created before content hashing lack the column
+                cursor.execute("PRAGMA table_info(documents)")
+                if "content_hash" not in {row[1] for row in cursor.fetchall()}:
+                    cursor.execute("ALTER TABLE documents ADD COLUMN content_hash TEXT")
+                
+                cursor.execute('''
+                    CREATE INDEX IF NOT EXISTS idx_documents_content_hash
+                    ON documents (content_hash)
+                ''')
+                
                 # Processing logs table
                 cursor.execute('''
                     CREATE TABLE IF NOT EXISTS processing_logs (
@@ -173,8 +184,8 @@ class DynamicDatabaseTool(BaseTool):
                     INSERT INTO documents (
                         file_path, document_type, extraction_timestamp, 
                         validation_status, is_valid, quality_score, completeness_score,
-                        raw_data, processed_data
-                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                        raw_data, processed_data, content_hash
+                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
                 ''', (
                     data.get('file_path', ''),
                     data.get('document_type', 'UNKNOWN'),
@@ -184,7 +195,8 @@ class DynamicDatabaseTool(BaseTool):
                     data.get('overall_score', 0.0),
                     data.get('completeness_score', 0.0),
                     json.dumps(data.get('extracted_data', {})),
-                    json.dumps(data)
+                    json.dumps(data),
+                    data.get('content_hash')
                 ))
                 
                 document_id = cursor.lastrowid
@@ -413,11 +425,7 @@ class DatabaseAgent:
     def __init__(self, db_path: str = "documents.db"):
         self.logger = setup_logging()
         self.db_path = db_path
-        self.llm = ChatOpenAI(
-            model=Config.OPENAI_MODEL,
-            temperature=0.1,
-            api_key=Config.OPENAI_API_KEY
-        )
+        self.llm = get_llm()
         self.tools = [DynamicDatabaseTool(db_path)]
         self.agent = self._create_agent()
     
@@ -468,7 +476,11 @@ class DatabaseAgent:
                 "overall_score": validation_data.get("overall_score", 0.0),
                 "completeness_score": validation_data.get("completeness_score", 0.0),
                 "extracted_data": validation_data.get("extracted_data", {}),
-                "validation_details": validation_data.get("validation_details", {})
+                "validation_details": validation_data.get("validation_details", {}),
+                "errors": validation_data.get("errors", []),
+                "warnings": validation_data.get("warnings", []),
+                "extraction_result": validation_data.get("extraction_result"),
+                "content_hash": validation_data.get("content_hash")
             }
             
             operation = f"STORE_VALIDATION:{json.dumps(storage_data)}"
@@ -502,7 +514,52 @@ class DatabaseAgent:
                 "error_message": str(e)
             }
     
-    def log_processing(self, document_id: int, agent_name: str, action: str, 
+    def get_document_by_hash(self, content_hash: str) -> Optional[Dict[str, Any]]:
+        """Return the most recent successfully validated document with this file content hash, if any"""
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                cursor = conn.cursor()
+                
+                cursor.execute('''
+                    SELECT id, file_path, document_type, processed_data
+                    FROM documents
+                    WHERE content_hash = ? AND validation_status = 'passed' AND is_valid = 1
+                    ORDER BY id DESC
+                    LIMIT 1
+                ''', (content_hash,))
+                
+                doc_record = cursor.fetchone()
+                if not doc_record:
+                    return None
+                
+                processed_data = json.loads(doc_record[3]) if doc_record[3] else {}
+                extraction_result = processed_data.get("extraction_result")
+                # Rows stored without the extraction result cannot rebuild a full result
+                if not extraction_result:
+                    return None
+                
+                return {
+                    "id": doc_record[0],
+                    "file_path": doc_record[1],
+                    "document_type": doc_record[2],
+                    "extracted_data": extraction_result,
+                    "validated_data": {
+                        "validation_status": processed_data.get("validation_status"),
+                        "document_type": processed_data.get("document_type", doc_record[2]),
+                        "validation_details": processed_data.get("validation_details", {}),
+                        "errors": processed_data.get("errors", []),
+                        "warnings": processed_data.get("warnings", []),
+                        "overall_score": processed_data.get("overall_score", 0.0),
+                        "extracted_data": processed_data.get("extracted_data", {}),
+                        "is_valid": processed_data.get("is_valid", False)
+                    }
+                }
+        
+        except Exception as e:
+            self.logger.error(f"Error looking up document by hash: {e}")
+            return None
+    
+    def log_processing(self, document_id: int, agent_name: str, action: str,
                       status: str, details: Dict[str, Any] = None) -> Dict[str, Any]:
         """Log processing activity"""
         try:
@@ -3,6 +3,13 @@ import json
 from typing import Dict, Any
 
 
+# Aadhaar pattern: 12-digit number in format "XXXX XXXX XXXX"
+AADHAAR_RE = re.compile(r'\b\d{4}\s\d{4}\s\d{4}\b')
+
+# PAN pattern: 10-character alphanumeric code (5 letters + 4 digits + 1 letter)
+PAN_RE = re.compile(r'\b[A-Z]{5}[0-9]{4}[A-Z]{1}\b')
+
+
 class DocumentClassifierAgent:
     """
     Document Classifier Agent that determines whether extracted text is from an Aadhaar card or PAN card.
@@ -10,11 +17,8 @@ class DocumentClassifierAgent:
     """
     
     def __init__(self):
-        # Aadhaar pattern: 12-digit number in format "XXXX XXXX XXXX"
-        self.aadhaar_pattern = r'\b\d{4}\s\d{4}\s\d{4}\b'
-        
-        # PAN pattern: 10-character alphanumeric code (5 letters + 4 digits + 1 letter)
-        self.pan_pattern = r'\b[A-Z]{5}[0-9]{4}[A-Z]{1}\b'
+        self.aadhaar_pattern = AADHAAR_RE
+        self.pan_pattern = PAN_RE
         
         # Additional Aadhaar keywords for better detection
         self.aadhaar_keywords = [
@@ -45,11 +49,11 @@ class DocumentClassifierAgent:
         normalized_text = extracted_text.lower().strip()
         
         # Check for Aadhaar patterns
-        aadhaar_matches = re.findall(self.aadhaar_pattern, extracted_text)
+        aadhaar_matches = self.aadhaar_pattern.findall(extracted_text)
         aadhaar_keyword_matches = any(keyword in normalized_text for keyword in self.aadhaar_keywords)
         
         # Check for PAN patterns
-        pan_matches = re.findall(self.pan_pattern, extracted_text)
+        pan_matches = self.pan_pattern.findall(extracted_text)
         pan_keyword_matches = any(keyword in normalized_text for keyword in self.pan_keywords)
         
         # Classification logic - prioritize exact pattern matches over keywords
@@ -100,6 +104,10 @@ class DocumentClassifierAgent:
         }, indent=2)
 
 
+# Shared classifier instance for the LangGraph node (the agent is stateless)
+_default_classifier = None
+
+
 # Function for LangGraph integration
 def classify_document(extracted_text: str) -> str:
     """
@@ -111,8 +119,10 @@ def classify_document(extracted_text: str) -> str:
     Returns:
         JSON string with document type classification
     """
-    classifier = DocumentClassifierAgent()
-    return classifier.process(extracted_text)
+    global _default_classifier
+    if _default_classifier is None:
+        _default_classifier = DocumentClassifierAgent()
+    return _default_classifier.process(extracted_text)
 
 
 if __name__ == "__main__":
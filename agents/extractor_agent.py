@@ -1,20 +1,73 @@
-from langchain_openai import ChatOpenAI
 from langchain_core.messages import HumanMessage, SystemMessage
 from tools.pdf_extractor_tool import PDFExtractorTool
 from typing import Dict, Any
-from config import Config
+from agents.llm_client import get_llm
+import json
 import logging
 
+# Bit positions for field-presence masks used by confidence scoring
+ALL_FIELDS = [
+    "Aadhaar Number", "PAN Number", "Name", "DOB", "Gender", "Address",
+    "Father's Name", "Father's/Guardian's Name"
+]
+FIELD_INDEX = {name: i for i, name in enumerate(ALL_FIELDS)}
+
+
+def _field_mask(fields) -> int:
+    """Build a bitmask with one bit set per field name"""
+    mask = 0
+    for field in fields:
+        mask |= 1 << FIELD_INDEX[field]
+    return mask
+
+
+# (required_mask, optional_mask) per document type
+CONFIDENCE_MASKS = {
+    "AADHAAR": (
+        _field_mask(["Aadhaar Number", "Name", "DOB"]),
+        _field_mask(["Gender", "Address", "Father's/Guardian's Name"])
+    ),
+    "PAN": (
+        _field_mask(["PAN Number", "Name"]),
+        _field_mask(["Father's Name", "DOB"])
+    )
+}
+
+
 class ExtractorAgent:
     """Agent responsible for document extraction and field identification"""
     
+    # Only ambiguous extractions are worth an LLM pass: high confidence is
+    # already good enough and low confidence is not recoverable
+    LLM_ENHANCEMENT_MIN_CONFIDENCE = 0.4
+    LLM_ENHANCEMENT_MAX_CONFIDENCE = 0.8
+    
+    ENHANCEMENT_PROMPT_PREFIX = """
+            Analyze the extracted document data given at the end of this message and enhance it if needed.
+            
+            Please:
+            1. Review the extracted fields for accuracy
+            2. Suggest any missing fields that should be extracted
+            3. Validate the document type detection
+            4. Provide confidence scores for each field
+            5. Identify any potential issues or inconsistencies
+            
+            Return your analysis as a JSON object with the following structure:
+            {
+                "enhanced_fields": {},
+                "missing_fields": [],
+                "confidence_scores": {},
+                "issues": [],
+                "recommendations": []
+            }
+            
+            ---
+            Document-specific data:
+            """
+    
     def __init__(self):
         self.tool = PDFExtractorTool()
-        self.llm = ChatOpenAI(
-            model=Config.OPENAI_MODEL,
-            temperature=0.1,
-            api_key=Config.OPENAI_API_KEY
-        )
+        self.llm = get_llm()
         
         self.system_prompt = """You are an expert document processing specialist with years of experience 
         in extracting information from Indian government documents like PAN cards and Aadhaar cards. 
@@ -29,6 +82,9 @@ class ExtractorAgent:
         
         For PAN cards, extract: PAN Number, Name, Father's Name, DOB (if available)
         For Aadhaar cards, extract: Aadhaar Number, Name, DOB, Gender, Address, Father's/Guardian's Name"""
+        
+        # The system prompt never changes, so build its message once
+        self._system_msg = SystemMessage(content=self.system_prompt)
     
     def run(self, pdf_path: str) -> Dict[str, Any]:
         """Extract fields from PDF document"""
@@ -36,17 +92,22 @@ class ExtractorAgent:
             # Use the tool directly for extraction
             extracted_data = self.tool.extract_fields(pdf_path)
             
-            # If extraction was successful, enhance with LLM analysis
-            if extracted_data and "error" not in extracted_data:
+            confidence = self._calculate_confidence(extracted_data)
+            
+            # If extraction was ambiguous, enhance with LLM analysis
+            if (extracted_data and "error" not in extracted_data and
+                    self.LLM_ENHANCEMENT_MIN_CONFIDENCE <= confidence <= self.LLM_ENHANCEMENT_MAX_CONFIDENCE):
                 enhanced_data = self._enhance_extraction_with_llm(extracted_data, pdf_path)
-                extracted_data.update(enhanced_data)
+                if enhanced_data:
+                    extracted_data.update(enhanced_data)
+                    confidence = self._calculate_confidence(extracted_data)
             
             # Add metadata
             extraction_result = {
                 "status": "success",
                 "file_path": pdf_path,
                 "extracted_data": extracted_data,
-                "extraction_confidence": self._calculate_confidence(extracted_data)
+                "extraction_confidence": confidence
             }
             
             logging.info(f"Successfully extracted data from {pdf_path}")
@@ -65,46 +126,34 @@ class ExtractorAgent:
     def _enhance_extraction_with_llm(self, extracted_data: Dict[str, Any], pdf_path: str) -> Dict[str, Any]:
         """Enhance extraction results using LLM analysis"""
         try:
-            prompt = f"""
-            Analyze the following extracted document data and enhance it if needed:
-            
+            # Stable instructions first so the prompt prefix is identical across
+            # documents; per-document data goes last
+            prompt = self.ENHANCEMENT_PROMPT_PREFIX + f"""
             Document Path: {pdf_path}
             Document Type: {extracted_data.get('document_type', 'Unknown')}
             Extracted Data: {extracted_data}
-            
-            Please:
-            1. Review the extracted fields for accuracy
-            2. Suggest any missing fields that should be extracted
-            3. Validate the document type detection
-            4. Provide confidence scores for each field
-            5. Identify any potential issues or inconsistencies
-            
-            Return your analysis as a JSON object with the following structure:
-            {{
-                "enhanced_fields": {{}},
-                "missing_fields": [],
-                "confidence_scores": {{}},
-                "issues": [],
-                "recommendations": []
-            }}
             """
             
             messages = [
-                SystemMessage(content=self.system_prompt),
+                self._system_msg,
                 HumanMessage(content=prompt)
             ]
             
             response = self.llm.invoke(messages)
             
-            # Parse LLM response and enhance data
-            enhanced_data = {}
+            usage = (getattr(response, "response_metadata", None) or {}).get("token_usage") or {}
+            cached_tokens = (usage.get("prompt_tokens_details") or {}).get("cached_tokens", 0)
+            logging.debug(f"LLM enhancement prompt tokens: {usage.get('prompt_tokens', 0)} (cached: {cached_tokens})")
             
-            # Add any enhanced fields or corrections
-            if "enhanced_fields" in response.content:
-                # Parse and apply enhancements
-                pass
+            # Parse LLM response and apply any enhanced fields or corrections
+            try:
+                analysis = json.loads(response.content)
+            except json.JSONDecodeError:
+                logging.warning("LLM enhancement returned invalid JSON; keeping tool output")
+                return {}
             
-            return enhanced_data
+            enhanced_data = analysis.get("enhanced_fields") if isinstance(analysis, dict) else None
+            return enhanced_data if isinstance(enhanced_data, dict) else {}
             
         except Exception as e:
             logging.warning(f"LLM enhancement failed: {e}")
@@ -117,18 +166,21 @@ class ExtractorAgent:
         
         doc_type = extracted_data.get("document_type", "UNKNOWN")
         
-        if doc_type == "AADHAAR":
-            required_fields = ["Aadhaar Number", "Name", "DOB"]
-            optional_fields = ["Gender", "Address", "Father's/Guardian's Name"]
-        elif doc_type == "PAN":
-            required_fields = ["PAN Number", "Name"]
-            optional_fields = ["Father's Name", "DOB"]
-        else:
+        masks = CONFIDENCE_MASKS.get(doc_type)
+        if masks is None:
             return 0.3  # Low confidence for unknown document type
+        required_mask, optional_mask = masks
+        
+        # Encode the non-empty fields as a presence bitmask
+        present_mask = 0
+        for field, value in extracted_data.items():
+            bit = FIELD_INDEX.get(field)
+            if bit is not None and value:
+                present_mask |= 1 << bit
         
         # Calculate score
-        required_score = sum(1 for field in required_fields if field in extracted_data and extracted_data[field]) / len(required_fields)
-        optional_score = sum(1 for field in optional_fields if field in extracted_data and extracted_data[field]) / len(optional_fields)
+        required_score = bin(present_mask & required_mask).count("1") / bin(required_mask).count("1")
+        optional_score = bin(present_mask & optional_mask).count("1") / bin(optional_mask).count("1")
         
         # Weight required fields more heavily
         confidence = (required_score * 0.7 + optional_score * 0.3)
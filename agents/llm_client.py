@@ -0,0 +1,12 @@
+from functools import lru_cache
+from langchain_openai import ChatOpenAI
+from config import Config
+
+@lru_cache(maxsize=1)
+def get_llm() -> ChatOpenAI:
+    """Return the process-wide ChatOpenAI client, created on first use"""
+    return ChatOpenAI(
+        model=Config.OPENAI_MODEL,
+        temperature=0.1,
+        api_key=Config.OPENAI_API_KEY
+    )
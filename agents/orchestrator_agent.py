@@ -1,7 +1,9 @@
 import os
 import sys
 import json
+import hashlib
 import logging
+from collections import deque
 from typing import Dict, Any, Optional
 from pathlib import Path
 
@@ -19,6 +21,44 @@ from tools.pdf_extractor_tool import PDFExtractorTool
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+
+# Oldest log entries are evicted beyond this many per status list
+MAX_LOG_ENTRIES = 1024
+
+
+def _bounded_log() -> deque:
+    return deque(maxlen=MAX_LOG_ENTRIES)
+
+
+class ProcessingStatus:
+    """Per-document status tracked by the orchestrator"""
+    __slots__ = ("document_path", "document_type", "extraction_status", "validation_status",
+                 "storage_status", "errors", "warnings", "processing_log")
+    
+    def __init__(self, document_path: Optional[str] = None, document_type: Optional[str] = None):
+        self.document_path = document_path
+        self.document_type = document_type
+        self.extraction_status = "pending"
+        self.validation_status = "pending"
+        self.storage_status = "pending"
+        self.errors = _bounded_log()
+        self.warnings = _bounded_log()
+        self.processing_log = _bounded_log()
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert status to a JSON-serializable dict"""
+        return {
+            "document_path": self.document_path,
+            "document_type": self.document_type,
+            "extraction_status": self.extraction_status,
+            "validation_status": self.validation_status,
+            "storage_status": self.storage_status,
+            "errors": list(self.errors),
+            "warnings": list(self.warnings),
+            "processing_log": list(self.processing_log)
+        }
+
+
 class OrchestratorAgent:
     """
     Orchestrator Agent that coordinates the entire document processing pipeline:
@@ -38,16 +78,7 @@ class OrchestratorAgent:
         self.pdf_extractor = PDFExtractorTool()
         
         # Processing status tracking
-        self.processing_status = {
-            "document_path": None,
-            "document_type": None,
-            "extraction_status": "pending",
-            "validation_status": "pending",
-            "storage_status": "pending",
-            "errors": [],
-            "warnings": [],
-            "processing_log": []
-        }
+        self.processing_status = ProcessingStatus()
     
     def log_step(self, step: str, message: str, status: str = "info"):
         """Log a processing step with timestamp"""
@@ -56,13 +87,13 @@ class OrchestratorAgent:
         log_entry = f"[{timestamp}] {step}: {message}"
         
         if status == "error":
-            self.processing_status["errors"].append(log_entry)
+            self.processing_status.errors.append(log_entry)
             logger.error(log_entry)
         elif status == "warning":
-            self.processing_status["warnings"].append(log_entry)
+            self.processing_status.warnings.append(log_entry)
             logger.warning(log_entry)
         else:
-            self.processing_status["processing_log"].append(log_entry)
+            self.processing_status.processing_log.append(log_entry)
             logger.info(log_entry)
     
     def extract_text_from_pdf(self, pdf_path: str) -> Optional[str]:
@@ -70,9 +101,15 @@ class OrchestratorAgent:
         try:
             self.log_step("PDF_EXTRACTION", f"Extracting text from {pdf_path}")
             
-            if not os.path.exists(pdf_path):
+            # Single stat: existence check and size in one syscall
+            try:
+                file_stat = os.stat(pdf_path)
+            except FileNotFoundError:
                 raise FileNotFoundError(f"PDF file not found: {pdf_path}")
             
+            if file_stat.st_size == 0:
+                raise ValueError(f"PDF file is empty: {pdf_path}")
+            
             result = self.pdf_extractor.extract_text(pdf_path)
             extracted_text = result.get('extracted_text', '')
             
@@ -94,10 +131,12 @@ class OrchestratorAgent:
             classification_result = self.classifier.classify_document(extracted_text)
             document_type = classification_result.get('document_type', 'UNKNOWN')
             
+            self.processing_status.document_type = document_type
+            
             if document_type == 'UNKNOWN':
-                raise ValueError("Document type could not be determined")
+                self.log_step("CLASSIFICATION", "Document type could not be determined", "warning")
+                return document_type
             
-            self.processing_status["document_type"] = document_type
             self.log_step("CLASSIFICATION", f"Document classified as: {document_type}")
             
             return document_type
@@ -121,13 +160,13 @@ class OrchestratorAgent:
             if not extraction_result or extraction_result.get('status') == 'error':
                 raise ValueError("Data extraction failed")
             
-            self.processing_status["extraction_status"] = "completed"
+            self.processing_status.extraction_status = "completed"
             self.log_step("EXTRACTION", "Data extraction completed successfully")
             
             return extraction_result
             
         except Exception as e:
-            self.processing_status["extraction_status"] = "failed"
+            self.processing_status.extraction_status = "failed"
             self.log_step("EXTRACTION", f"Data extraction failed: {str(e)}", "error")
             return None
     
@@ -144,21 +183,28 @@ class OrchestratorAgent:
             if not validation_result or validation_result.get('validation_status') == 'failed':
                 raise ValueError("Data validation failed")
             
-            self.processing_status["validation_status"] = "completed"
+            self.processing_status.validation_status = "completed"
             self.log_step("VALIDATION", "Data validation completed successfully")
             
             return validation_result
             
         except Exception as e:
-            self.processing_status["validation_status"] = "failed"
+            self.processing_status.validation_status = "failed"
             self.log_step("VALIDATION", f"Data validation failed: {str(e)}", "error")
             return None
     
-    def store_data(self, document_type: str, validated_data: Dict[str, Any]) -> bool:
+    def store_data(self, document_type: str, validated_data: Dict[str, Any],
+                   content_hash: Optional[str] = None,
+                   extracted_data: Optional[Dict[str, Any]] = None) -> bool:
         """Store validated data in database using DB Agent"""
         try:
             self.log_step("STORAGE", f"Storing {document_type} data in database")
             
+            if content_hash:
+                # Keep the extraction result so a cache hit can return the full result
+                validated_data = {**validated_data, "content_hash": content_hash,
+                                  "extraction_result": extracted_data}
+            
             storage_result = self.db_agent.store_document_data(
                 document_type=document_type,
                 validated_data=validated_data
@@ -167,13 +213,13 @@ class OrchestratorAgent:
             if not storage_result or storage_result.get('status') == 'error':
                 raise ValueError("Data storage failed")
             
-            self.processing_status["storage_status"] = "completed"
+            self.processing_status.storage_status = "completed"
             self.log_step("STORAGE", "Data stored successfully in database")
             
             return True
             
         except Exception as e:
-            self.processing_status["storage_status"] = "failed"
+            self.processing_status.storage_status = "failed"
             self.log_step("STORAGE", f"Data storage failed: {str(e)}", "error")
             return False
     
@@ -188,20 +234,17 @@ class OrchestratorAgent:
             Dict containing processing results and status
         """
         # Initialize processing status
-        self.processing_status = {
-            "document_path": pdf_path,
-            "document_type": None,
-            "extraction_status": "pending",
-            "validation_status": "pending",
-            "storage_status": "pending",
-            "errors": [],
-            "warnings": [],
-            "processing_log": []
-        }
+        self.processing_status = ProcessingStatus(document_path=pdf_path)
         
         self.log_step("ORCHESTRATOR", f"Starting document processing for: {pdf_path}")
         
         try:
+            # Step 0: Return the stored result if this exact file was already processed
+            content_hash = self.compute_file_hash(pdf_path)
+            cached_record = self.db_agent.get_document_by_hash(content_hash) if content_hash else None
+            if cached_record:
+                return self._cached_result(cached_record)
+            
             # Step 1: Extract text from PDF
             extracted_text = self.extract_text_from_pdf(pdf_path)
             if not extracted_text:
@@ -212,6 +255,17 @@ class OrchestratorAgent:
             if not document_type:
                 raise Exception("Document classification failed")
             
+            # Unclassifiable documents are rejected before any extraction work
+            if document_type == "UNKNOWN":
+                self.log_step("ORCHESTRATOR", "Document rejected: type could not be determined", "warning")
+                
+                return {
+                    "status": "rejected",
+                    "document_type": document_type,
+                    "error_message": "Document type could not be determined",
+                    "processing_status": self.processing_status.to_dict()
+                }
+            
             # Step 3: Extract data
             extracted_data = self.extract_data(document_type, extracted_text)
             if not extracted_data:
@@ -223,7 +277,7 @@ class OrchestratorAgent:
                 raise Exception("Data validation failed")
             
             # Step 5: Store data
-            storage_success = self.store_data(document_type, validated_data)
+            storage_success = self.store_data(document_type, validated_data, content_hash, extracted_data)
             if not storage_success:
                 raise Exception("Data storage failed")
             
@@ -235,7 +289,7 @@ class OrchestratorAgent:
                 "document_type": document_type,
                 "extracted_data": extracted_data,
                 "validated_data": validated_data,
-                "processing_status": self.processing_status
+                "processing_status": self.processing_status.to_dict()
             }
             
         except Exception as e:
@@ -244,23 +298,53 @@ class OrchestratorAgent:
             return {
                 "status": "error",
                 "error_message": str(e),
-                "processing_status": self.processing_status
+                "processing_status": self.processing_status.to_dict()
             }
     
+    def compute_file_hash(self, pdf_path: str) -> Optional[str]:
+        """Hash the file contents (BLAKE2b, 128-bit) for idempotent reprocessing"""
+        try:
+            hasher = hashlib.blake2b(digest_size=16)
+            with open(pdf_path, "rb") as f:
+                for chunk in iter(lambda: f.read(1024 * 1024), b""):
+                    hasher.update(chunk)
+            return hasher.hexdigest()
+        except OSError as e:
+            self.log_step("ORCHESTRATOR", f"Could not hash file contents: {str(e)}", "warning")
+            return None
+    
+    def _cached_result(self, cached_record: Dict[str, Any]) -> Dict[str, Any]:
+        """Build a process_document result from a previously stored record"""
+        self.processing_status.document_type = cached_record["document_type"]
+        self.processing_status.extraction_status = "completed"
+        self.processing_status.validation_status = "completed"
+        self.processing_status.storage_status = "completed"
+        self.log_step("ORCHESTRATOR", f"Identical document already stored (ID {cached_record['id']}); skipping pipeline")
+        
+        return {
+            "status": "success",
+            "cached": True,
+            "document_id": cached_record["id"],
+            "document_type": cached_record["document_type"],
+            "extracted_data": cached_record["extracted_data"],
+            "validated_data": cached_record["validated_data"],
+            "processing_status": self.processing_status.to_dict()
+        }
+    
     def get_processing_summary(self) -> Dict[str, Any]:
         """Get a summary of the processing status"""
         return {
-            "document_path": self.processing_status["document_path"],
-            "document_type": self.processing_status["document_type"],
-            "overall_status": "completed" if self.processing_status["storage_status"] == "completed" else "failed",
+            "document_path": self.processing_status.document_path,
+            "document_type": self.processing_status.document_type,
+            "overall_status": "completed" if self.processing_status.storage_status == "completed" else "failed",
             "steps_completed": {
-                "extraction": self.processing_status["extraction_status"],
-                "validation": self.processing_status["validation_status"],
-                "storage": self.processing_status["storage_status"]
+                "extraction": self.processing_status.extraction_status,
+                "validation": self.processing_status.validation_status,
+                "storage": self.processing_status.storage_status
             },
-            "error_count": len(self.processing_status["errors"]),
-            "warning_count": len(self.processing_status["warnings"]),
-            "processing_log": self.processing_status["processing_log"][-10:]  # Last 10 log entries
+            "error_count": len(self.processing_status.errors),
+            "warning_count": len(self.processing_status.warnings),
+            "processing_log": list(self.processing_status.processing_log)[-10:]  # Last 10 log entries
         }
 
 
@@ -1,21 +1,136 @@
-from langchain_openai import ChatOpenAI
 from langchain_core.messages import HumanMessage, SystemMessage
+import asyncio
+import hashlib
 import re
 import json
-from datetime import datetime
+import threading
+from collections import Counter, OrderedDict
 from typing import Dict, Any, List, Optional
 from config import Config
+from agents.llm_client import get_llm
+from utils.time_utils import iso_now
 import logging
 
+def _compile_patterns(patterns: List[str]):
+    """Precompile patterns (IGNORECASE) in priority order.
+    
+    Returns the compiled patterns plus, for each pattern, the index of the
+    group holding its extracted value.
+    """
+    compiled = tuple(re.compile(pattern, re.IGNORECASE) for pattern in patterns)
+    # Value is the 2nd group for "(label)(value)" patterns, the 1st for
+    # "(value)" patterns, and the whole match otherwise
+    value_groups = tuple(min(regex.groups, 2) for regex in compiled)
+    return compiled, value_groups
+
+
+def _candidates_by_priority(patterns, text: str):
+    """Yield the first value found by each pattern, in pattern order.
+    
+    Each pattern is searched on its own: a single sweep over an alternation
+    lets a lower-priority match consume text a higher-priority pattern needs.
+    """
+    compiled, value_groups = patterns
+    for regex, value_group in zip(compiled, value_groups):
+        match = regex.search(text)
+        if match:
+            yield match.group(value_group)
+
+
+# PAN Number patterns (10 characters: 5 letters + 4 digits + 1 letter)
+_PAN_PATTERNS = _compile_patterns([
+    r'\b[A-Z]{5}[0-9]{4}[A-Z]{1}\b',  # Standard PAN format
+    r'\b[A-Z]{5}\s*[0-9]{4}\s*[A-Z]{1}\b',  # PAN with spaces
+    r'PAN[:\s]*([A-Z]{5}[0-9]{4}[A-Z]{1})',  # PAN with label
+    r'Permanent Account Number[:\s]*([A-Z]{5}[0-9]{4}[A-Z]{1})'  # Full label
+])
+
+# Date of Birth patterns
+_DOB_PATTERNS = _compile_patterns([
+    r'(DOB|Date of Birth)[\s:]*([\d]{1,2}[-/][\d]{1,2}[-/][\d]{2,4})',
+    r'(\d{1,2}[-/]\d{1,2}[-/]\d{2,4})',
+    r'(\d{2}[-/]\d{2}[-/]\d{4})',  # DD/MM/YYYY format
+    r'(\d{4}[-/]\d{2}[-/]\d{2})'   # YYYY/MM/DD format
+])
+
+# A name is up to five words of bounded length. Words and separators use
+# disjoint character classes, so matching stays linear on long OCR text.
+_NAME_VALUE = r'[A-Z][a-zA-Z]{0,39}(?:\s+[A-Za-z]{1,40}){0,4}'
+
+# Name patterns: labelled first, then unlabelled fallbacks
+_NAME_PATTERNS = _compile_patterns([
+    rf'(Name|NAME)[:\s]{{0,10}}({_NAME_VALUE})',
+    rf'Card Holder Name[:\s]{{0,10}}({_NAME_VALUE})',
+    r'([A-Z][a-z]+\s+[A-Z][a-z]+)',  # Two words like "John Doe"
+    rf'({_NAME_VALUE})'  # General name pattern
+])
+
+# Father's Name patterns
+_FATHER_NAME_PATTERNS = _compile_patterns([
+    rf'(Father\'s Name|Father Name|FATHER\'S NAME)[:\s]{{0,10}}({_NAME_VALUE})',
+    rf'(S/O|Son of)[:\s]{{0,10}}({_NAME_VALUE})',
+    rf'(D/O|Daughter of)[:\s]{{0,10}}({_NAME_VALUE})',
+    rf'(W/O|Wife of)[:\s]{{0,10}}({_NAME_VALUE})',
+    rf'Guardian[:\s]{{0,10}}({_NAME_VALUE})'
+])
+
+# Common card words that are never a person's name
+_NAME_SKIP_WORDS = frozenset({'DOB', 'PAN', 'GOVT', 'INDIA', 'DEPARTMENT', 'AUTHORITY', 'UNIQUE', 'PERMANENT', 'ACCOUNT', 'NUMBER', 'CARD'})
+
+_VALID_PAN_RE = re.compile(r'^[A-Z]{5}[0-9]{4}[A-Z]$')
+_VALID_DATE_RE = re.compile(r'^\d{1,2}[-/]\d{1,2}[-/]\d{4}$')
+_DIGIT_RE = re.compile(r'\d')
+_DATE_SEPARATORS = str.maketrans('-', '/')
+_YMD_DATE_RE = re.compile(r'^(\d{4})/(\d{1,2})/(\d{1,2})$')
+_DMY_DATE_RE = re.compile(r'^(\d{1,2})/(\d{1,2})/(\d{2,4})$')
+_ASCENDING_DIGITS_RE = re.compile(r'012|123|234|345|456|567|678|789')
+
+# Field labels and value-shaped tokens; only text around these is sent to the LLM
+_LLM_ANCHOR_RE = re.compile(
+    r'Name|Father|Guardian|S/O|D/O|W/O|DOB|Date of Birth|Permanent Account'
+    r'|\b[A-Z]{5}\s*[0-9]{4}\s*[A-Z]\b|\d{1,2}[-/]\d{1,2}[-/]\d{2,4}',
+    re.IGNORECASE
+)
+LLM_CONTEXT_WINDOW = 80
+LLM_FALLBACK_CONTEXT = 800
+
+# Exact-match cache of parsed LLM extractions keyed on the OCR text.
+# Bump PROMPT_VERSION whenever the extraction prompt changes.
+PROMPT_VERSION = "3"
+LLM_CACHE_SIZE = 512
+_llm_cache: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+_llm_cache_lock = threading.Lock()
+
+
+def _llm_cache_key(text: str) -> str:
+    """Cache key for an LLM extraction of text"""
+    return hashlib.sha256((PROMPT_VERSION + text).encode('utf-8')).hexdigest()
+
+
+def _llm_cache_get(key: str) -> Optional[Dict[str, Any]]:
+    """Return a copy of the cached extraction for key, if any"""
+    with _llm_cache_lock:
+        cached = _llm_cache.get(key)
+        if cached is None:
+            return None
+        _llm_cache.move_to_end(key)
+        return dict(cached)
+
+
+def _llm_cache_put(key: str, result: Dict[str, Any]):
+    """Store an extraction, evicting the least recently used entry when full"""
+    with _llm_cache_lock:
+        _llm_cache[key] = dict(result)
+        _llm_cache.move_to_end(key)
+        if len(_llm_cache) > LLM_CACHE_SIZE:
+            _llm_cache.popitem(last=False)
+
+
 class PANExtractorAgent:
     """PAN Card extraction agent with enhanced pattern recognition"""
     
     def __init__(self):
-        self.llm = ChatOpenAI(
-            model=Config.OPENAI_MODEL,
-            temperature=0.1,
-            api_key=Config.OPENAI_API_KEY
-        )
+        self.llm = get_llm()
         
         self.system_prompt = """You are a specialized PAN card information extraction expert. 
         Your role is to accurately extract key information from PAN card documents including:
@@ -33,6 +148,9 @@ class PANExtractorAgent:
         - Handle OCR artifacts and clean extracted text
         - Provide confidence scores for each extracted field
         - Return results in structured JSON format"""
+        
+        # Built once and reused for every LLM call
+        self._system_msg = SystemMessage(content=self.system_prompt)
     
     def extract_pan_fields(self, raw_text: str) -> Dict[str, Any]:
         """Extract PAN card fields from raw text using pattern matching and LLM"""
@@ -41,32 +159,92 @@ class PANExtractorAgent:
             # First, use pattern matching for critical fields
             pattern_results = self._extract_with_patterns(raw_text)
             
+            # Clean cards are fully handled by the patterns
+            pattern_only = self._pattern_only_result(raw_text, pattern_results)
+            if pattern_only:
+                return pattern_only
+            
             # Then use LLM for validation and enhancement
             llm_results = self._extract_with_llm(raw_text, pattern_results)
             
-            # Combine and validate results
-            final_results = self._combine_results(pattern_results, llm_results)
+            return self._build_extraction_result(raw_text, pattern_results, llm_results)
             
-            # Calculate confidence scores
-            confidence_scores = self._calculate_field_confidence(final_results, raw_text)
+        except Exception as e:
+            return self._extraction_error(e)
+    
+    async def aextract_pan_fields(self, raw_text: str) -> Dict[str, Any]:
+        """Async variant of extract_pan_fields that awaits the LLM call"""
+        
+        try:
+            pattern_results = self._extract_with_patterns(raw_text)
+            pattern_only = self._pattern_only_result(raw_text, pattern_results)
+            if pattern_only:
+                return pattern_only
             
-            return {
-                "status": "success",
-                "extracted_data": final_results,
-                "confidence_scores": confidence_scores,
-                "overall_confidence": self._calculate_overall_confidence(confidence_scores),
-                "extraction_method": "pattern_matching_and_llm",
-                "timestamp": datetime.now().isoformat()
-            }
+            llm_results = await self._aextract_with_llm(raw_text, pattern_results)
+            return self._build_extraction_result(raw_text, pattern_results, llm_results)
             
         except Exception as e:
-            logging.error(f"PAN extraction error: {e}")
-            return {
-                "status": "error",
-                "error_message": str(e),
-                "extracted_data": {},
-                "timestamp": datetime.now().isoformat()
-            }
+            return self._extraction_error(e)
+    
+    def extract_batch(self, texts: List[str], max_concurrency: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Extract PAN fields from many texts with overlapping LLM calls; results keep input order"""
+        limit = max_concurrency or Config.LLM_MAX_CONCURRENCY
+        
+        async def run_all():
+            semaphore = asyncio.Semaphore(limit)
+            
+            async def extract_one(text):
+                async with semaphore:
+                    return await self.aextract_pan_fields(text)
+            
+            return await asyncio.gather(*(extract_one(text) for text in texts))
+        
+        return asyncio.run(run_all())
+    
+    def _pattern_only_result(self, raw_text: str, pattern_results: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Return the pattern-only result if its confidence makes the LLM call unnecessary"""
+        confidence_scores = self._calculate_field_confidence(pattern_results, raw_text)
+        overall_confidence = self._calculate_overall_confidence(confidence_scores)
+        if overall_confidence < Config.LLM_SKIP_THRESHOLD:
+            return None
+        
+        return {
+            "status": "success",
+            "extracted_data": dict(pattern_results),
+            "confidence_scores": confidence_scores,
+            "overall_confidence": overall_confidence,
+            "extraction_method": "pattern_matching",
+            "timestamp": iso_now()
+        }
+    
+    def _build_extraction_result(self, raw_text: str, pattern_results: Dict[str, Any],
+                                 llm_results: Dict[str, Any]) -> Dict[str, Any]:
+        """Combine pattern and LLM results and score them"""
+        # Combine and validate results
+        final_results = self._combine_results(pattern_results, llm_results)
+        
+        # Calculate confidence scores
+        confidence_scores = self._calculate_field_confidence(final_results, raw_text)
+        
+        return {
+            "status": "success",
+            "extracted_data": final_results,
+            "confidence_scores": confidence_scores,
+            "overall_confidence": self._calculate_overall_confidence(confidence_scores),
+            "extraction_method": "pattern_matching_and_llm",
+            "timestamp": iso_now()
+        }
+    
+    def _extraction_error(self, error: Exception) -> Dict[str, Any]:
+        """Build the error result for a failed extraction"""
+        logging.error(f"PAN extraction error: {error}")
+        return {
+            "status": "error",
+            "error_message": str(error),
+            "extracted_data": {},
+            "timestamp": iso_now()
+        }
     
     def _extract_with_patterns(self, text: str) -> Dict[str, Any]:
         """Extract fields using regex patterns"""
@@ -77,122 +255,124 @@ class PANExtractorAgent:
             "PAN Number": None
         }
         
-        # PAN Number patterns (10 characters: 5 letters + 4 digits + 1 letter)
-        pan_patterns = [
-            r'\b[A-Z]{5}[0-9]{4}[A-Z]{1}\b',  # Standard PAN format
-            r'\b[A-Z]{5}\s*[0-9]{4}\s*[A-Z]{1}\b',  # PAN with spaces
-            r'PAN[:\s]*([A-Z]{5}[0-9]{4}[A-Z]{1})',  # PAN with label
-            r'Permanent Account Number[:\s]*([A-Z]{5}[0-9]{4}[A-Z]{1})'  # Full label
-        ]
-        
-        for pattern in pan_patterns:
-            match = re.search(pattern, text, re.IGNORECASE)
-            if match:
-                pan = match.group(1) if len(match.groups()) > 0 else match.group(0)
+        # Every PAN and DOB pattern needs a digit; one probe gates both sweeps
+        if _DIGIT_RE.search(text):
+            # PAN Number
+            for pan in _candidates_by_priority(_PAN_PATTERNS, text):
                 pan = pan.replace(" ", "").upper()
-                if len(pan) == 10 and re.match(r'^[A-Z]{5}[0-9]{4}[A-Z]$', pan):
+                if len(pan) == 10 and _VALID_PAN_RE.match(pan):
                     results['PAN Number'] = pan
                     break
+            
+            # Date of Birth
+            dob = next(_candidates_by_priority(_DOB_PATTERNS, text), None)
+            if dob:
+                results['DOB'] = self._standardize_date(dob)
         
-        # Date of Birth patterns
-        dob_patterns = [
-            r'(DOB|Date of Birth)[\s:]*([\d]{1,2}[-/][\d]{1,2}[-/][\d]{2,4})',
-            r'(\d{1,2}[-/]\d{1,2}[-/]\d{2,4})',
-            r'(\d{2}[-/]\d{2}[-/]\d{4})',  # DD/MM/YYYY format
-            r'(\d{4}[-/]\d{2}[-/]\d{2})'   # YYYY/MM/DD format
-        ]
+        # Name
+        for name in _candidates_by_priority(_NAME_PATTERNS, text):
+            if self._is_valid_name(name):
+                results['Name'] = name.strip()
+                break
         
-        for pattern in dob_patterns:
-            match = re.search(pattern, text, re.IGNORECASE)
-            if match:
-                dob = match.group(2) if len(match.groups()) > 1 else match.group(1)
-                results['DOB'] = self._standardize_date(dob)
+        # Father's Name
+        for father_name in _candidates_by_priority(_FATHER_NAME_PATTERNS, text):
+            if self._is_valid_name(father_name):
+                results['Father\'s Name'] = father_name.strip()
                 break
         
-        # Name patterns
-        name_patterns = [
-            r'(Name|NAME)[:\s]*([A-Z][a-zA-Z\s]{2,})',
-            r'Card Holder Name[:\s]*([A-Z][a-zA-Z\s]{2,})',
-            r'([A-Z][a-z]+\s+[A-Z][a-z]+)',  # Two words like "John Doe"
-            r'([A-Z][a-zA-Z\s]{2,})'  # General name pattern
-        ]
+        return results
+    
+    def _llm_context(self, text: str) -> str:
+        """Return only the parts of text around field labels and value-shaped tokens"""
+        spans = []
+        for match in _LLM_ANCHOR_RE.finditer(text):
+            start = max(0, match.start() - LLM_CONTEXT_WINDOW)
+            end = match.end() + LLM_CONTEXT_WINDOW
+            if spans and start <= spans[-1][1]:
+                spans[-1][1] = max(spans[-1][1], end)
+            else:
+                spans.append([start, end])
         
-        for pattern in name_patterns:
-            match = re.search(pattern, text, re.IGNORECASE)
-            if match:
-                name = match.group(2) if len(match.groups()) > 1 else match.group(1)
-                if self._is_valid_name(name):
-                    results['Name'] = name.strip()
-                    break
+        if not spans:
+            return text[:LLM_FALLBACK_CONTEXT]
         
-        # Father's Name patterns
-        father_name_patterns = [
-            r'(Father\'s Name|Father Name|FATHER\'S NAME)[:\s]*([A-Z][a-zA-Z\s]{2,})',
-            r'(S/O|Son of)[:\s]*([A-Z][a-zA-Z\s]{2,})',
-            r'(D/O|Daughter of)[:\s]*([A-Z][a-zA-Z\s]{2,})',
-            r'(W/O|Wife of)[:\s]*([A-Z][a-zA-Z\s]{2,})',
-            r'Guardian[:\s]*([A-Z][a-zA-Z\s]{2,})'
+        return "\n".join(text[start:end] for start, end in spans)[:2000]
+    
+    def _build_llm_messages(self, text: str, pattern_results: Dict[str, Any]) -> list:
+        """Build the LLM messages used to enhance and validate extracted fields"""
+        prompt = f"""
+        Analyze the following text from a PAN card document and extract the required information.
+        If you find any information that conflicts with the pattern-matching results, provide the correct information.
+        
+        Raw Text:
+        {self._llm_context(text)}
+        
+        Pattern Matching Results:
+        {json.dumps(pattern_results, separators=(',', ':'), ensure_ascii=False)}
+        
+        Please extract and return ONLY the following fields in JSON format:
+        {{
+            "Name": "Full name of the card holder",
+            "Father's Name": "Guardian's name (Father/Mother/Spouse)",
+            "DOB": "Date of Birth in DD/MM/YYYY format",
+            "PAN Number": "10-character PAN number (5 letters + 4 digits + 1 letter)"
+        }}
+        
+        Rules:
+        1. PAN Number must be exactly 10 characters: 5 letters + 4 digits + 1 letter
+        2. Names should be properly capitalized
+        3. Date should be in DD/MM/YYYY format
+        4. If a field is not found, use null
+        5. Clean any OCR artifacts from the text
+        """
+        
+        return [
+            self._system_msg,
+            HumanMessage(content=prompt)
         ]
-        
-        for pattern in father_name_patterns:
-            match = re.search(pattern, text, re.IGNORECASE)
-            if match:
-                father_name = match.group(2) if len(match.groups()) > 1 else match.group(1)
-                if self._is_valid_name(father_name):
-                    results['Father\'s Name'] = father_name.strip()
-                    break
-        
-        return results
+    
+    def _parse_llm_response(self, content: str, pattern_results: Dict[str, Any],
+                            cache_key: str) -> Dict[str, Any]:
+        """Parse the LLM response, falling back to pattern results if it is invalid"""
+        try:
+            llm_data = json.loads(content)
+            llm_results = {
+                "Name": llm_data.get("Name"),
+                "Father's Name": llm_data.get("Father's Name"),
+                "DOB": llm_data.get("DOB"),
+                "PAN Number": llm_data.get("PAN Number")
+            }
+            _llm_cache_put(cache_key, llm_results)
+            return llm_results
+        except json.JSONDecodeError:
+            # Fallback to pattern matching if LLM response is invalid
+            return pattern_results
     
     def _extract_with_llm(self, text: str, pattern_results: Dict[str, Any]) -> Dict[str, Any]:
         """Use LLM to enhance and validate extracted fields"""
+        cache_key = _llm_cache_key(text)
+        cached = _llm_cache_get(cache_key)
+        if cached is not None:
+            return cached
+        
         try:
-            prompt = f"""
-            Analyze the following text from a PAN card document and extract the required information.
-            If you find any information that conflicts with the pattern-matching results, provide the correct information.
-            
-            Raw Text:
-            {text[:2000]}  # Limit text length for LLM
-            
-            Pattern Matching Results:
-            {json.dumps(pattern_results, indent=2)}
-            
-            Please extract and return ONLY the following fields in JSON format:
-            {{
-                "Name": "Full name of the card holder",
-                "Father's Name": "Guardian's name (Father/Mother/Spouse)",
-                "DOB": "Date of Birth in DD/MM/YYYY format",
-                "PAN Number": "10-character PAN number (5 letters + 4 digits + 1 letter)"
-            }}
-            
-            Rules:
-            1. PAN Number must be exactly 10 characters: 5 letters + 4 digits + 1 letter
-            2. Names should be properly capitalized
-            3. Date should be in DD/MM/YYYY format
-            4. If a field is not found, use null
-            5. Clean any OCR artifacts from the text
-            """
-            
-            messages = [
-                SystemMessage(content=self.system_prompt),
-                HumanMessage(content=prompt)
-            ]
-            
-            response = self.llm.invoke(messages)
-            
-            # Parse LLM response
-            try:
-                llm_data = json.loads(response.content)
-                return {
-                    "Name": llm_data.get("Name"),
-                    "Father's Name": llm_data.get("Father's Name"),
-                    "DOB": llm_data.get("DOB"),
-                    "PAN Number": llm_data.get("PAN Number")
-                }
-            except json.JSONDecodeError:
-                # Fallback to pattern matching if LLM response is invalid
-                return pattern_results
-                
+            response = self.llm.invoke(self._build_llm_messages(text, pattern_results))
+            return self._parse_llm_response(response.content, pattern_results, cache_key)
+        except Exception as e:
+            logging.error(f"LLM extraction error: {e}")
+            return pattern_results
+    
+    async def _aextract_with_llm(self, text: str, pattern_results: Dict[str, Any]) -> Dict[str, Any]:
+        """Async variant of _extract_with_llm"""
+        cache_key = _llm_cache_key(text)
+        cached = _llm_cache_get(cache_key)
+        if cached is not None:
+            return cached
+        
+        try:
+            response = await self.llm.ainvoke(self._build_llm_messages(text, pattern_results))
+            return self._parse_llm_response(response.content, pattern_results, cache_key)
         except Exception as e:
             logging.error(f"LLM extraction error: {e}")
             return pattern_results
@@ -233,7 +413,7 @@ class PANExtractorAgent:
         # PAN Number confidence
         pan = results.get("PAN Number")
         if pan:
-            if re.match(r'^[A-Z]{5}[0-9]{4}[A-Z]$', pan):
+            if _VALID_PAN_RE.match(pan):
                 confidence_scores["PAN Number"] = 0.95
             else:
                 confidence_scores["PAN Number"] = 0.3
@@ -298,24 +478,17 @@ class PANExtractorAgent:
             return False
         
         # Skip common non-name words
-        skip_words = {'DOB', 'PAN', 'GOVT', 'INDIA', 'DEPARTMENT', 'AUTHORITY', 'UNIQUE', 'PERMANENT', 'ACCOUNT', 'NUMBER', 'CARD'}
-        if name.upper() in skip_words:
+        if name.upper() in _NAME_SKIP_WORDS:
             return False
         
         # Check if mostly alphabetic
-        alpha_ratio = sum(1 for c in name if c.isalpha()) / len(name)
+        alpha_ratio = sum(map(str.isalpha, name)) / len(name)
         return alpha_ratio > 0.6
     
     def _is_valid_date(self, date_str: str) -> bool:
         """Validate date format"""
-        if not date_str:
-            return False
-        
         # Check if it matches DD/MM/YYYY or DD-MM-YYYY
-        if re.match(r'^\d{1,2}[-/]\d{1,2}[-/]\d{4}$', date_str):
-            return True
-        
-        return False
+        return bool(date_str) and _VALID_DATE_RE.match(date_str) is not None
     
     def _standardize_date(self, date_str: str) -> str:
         """Standardize date to DD/MM/YYYY format"""
@@ -323,25 +496,22 @@ class PANExtractorAgent:
             return None
         
         # Handle different separators
-        date_str = date_str.replace('-', '/')
+        date_str = date_str.translate(_DATE_SEPARATORS)
         
-        # Parse and standardize
-        try:
-            parts = date_str.split('/')
-            if len(parts) == 3:
-                day, month, year = parts
-                
-                # Handle 2-digit years
-                if len(year) == 2:
-                    year = '20' + year if int(year) < 50 else '19' + year
-                
-                # Ensure proper formatting
-                day = day.zfill(2)
-                month = month.zfill(2)
-                
-                return f"{day}/{month}/{year}"
-        except:
-            pass
+        match = _YMD_DATE_RE.match(date_str)
+        if match:
+            year, month, day = match.groups()
+            return f"{day.zfill(2)}/{month.zfill(2)}/{year}"
+        
+        match = _DMY_DATE_RE.match(date_str)
+        if match:
+            day, month, year = match.groups()
+            
+            # Handle 2-digit years
+            if len(year) == 2:
+                year = '20' + year if int(year) < 50 else '19' + year
+            
+            return f"{day.zfill(2)}/{month.zfill(2)}/{year}"
         
         return date_str
     
@@ -352,8 +522,8 @@ class PANExtractorAgent:
         
         clean_pan = pan.replace(" ", "").upper()
         
-        # Check basic format
-        if not re.match(r'^[A-Z]{5}[0-9]{4}[A-Z]$', clean_pan):
+        # Check basic format; the length test rejects most OCR noise before the regex
+        if len(clean_pan) != 10 or not _VALID_PAN_RE.match(clean_pan):
             return {"valid": False, "reason": "invalid_format", "type": "invalid"}
         
         # Check for suspicious patterns
@@ -375,30 +545,61 @@ class PANExtractorAgent:
         if len(text) < 3:
             return False
         
-        # Check for sequential numbers
-        for i in range(len(text) - 2):
-            if text[i:i+3].isdigit():
-                nums = [int(c) for c in text[i:i+3]]
-                if nums == list(range(nums[0], nums[0] + 3)):
-                    return True
-        
-        return False
+        # Check for three ascending consecutive digits
+        return _ASCENDING_DIGITS_RE.search(text) is not None
     
     def _has_repeated_pattern(self, text: str) -> bool:
         """Check if text has repeated patterns"""
         if len(text) < 4:
             return False
         
-        # Check for repeated 2-char patterns
-        for i in range(len(text) - 3):
+        # Check for repeated 2-char patterns in one pass. Occurrences are
+        # counted without overlap, matching str.count.
+        counts = Counter()
+        last_start = {}
+        for i in range(len(text) - 1):
             pattern = text[i:i+2]
-            if text.count(pattern) > 2:
-                return True
+            if last_start.get(pattern, -2) <= i - 2:
+                last_start[pattern] = i
+                counts[pattern] += 1
+                if counts[pattern] > 2:
+                    return True
         
         return False
     
-    def generate_extraction_report(self, extraction_result: Dict[str, Any]) -> str:
-        """Generate a detailed extraction report"""
+    def generate_extraction_report(self, extraction_result: Dict[str, Any], use_llm: bool = False) -> str:
+        """Generate a detailed extraction report; use_llm asks the LLM for a narrative report"""
+        if use_llm:
+            return self._generate_llm_extraction_report(extraction_result)
+        
+        extracted_data = extraction_result.get('extracted_data', {})
+        confidence_scores = extraction_result.get('confidence_scores', {})
+        
+        lines = [
+            "PAN CARD EXTRACTION REPORT",
+            f"Extraction Status: {extraction_result.get('status', 'Unknown')}",
+            f"Overall Confidence: {extraction_result.get('overall_confidence', 0):.2%}",
+            f"Extraction Method: {extraction_result.get('extraction_method', 'Unknown')}",
+            "",
+            "Field Analysis:"
+        ]
+        missing_fields = []
+        for field in ["Name", "Father's Name", "DOB", "PAN Number"]:
+            value = extracted_data.get(field)
+            if not value:
+                missing_fields.append(field)
+            lines.append(f"  {field}: {value or 'Not found'} (confidence: {confidence_scores.get(field, 0.0):.0%})")
+        
+        if extraction_result.get('error_message'):
+            lines.extend(["", f"Error: {extraction_result['error_message']}"])
+        
+        if missing_fields:
+            lines.extend(["", f"Recommendations: re-scan or verify manually - missing {', '.join(missing_fields)}"])
+        
+        return "\n".join(lines)
+    
+    def _generate_llm_extraction_report(self, extraction_result: Dict[str, Any]) -> str:
+        """Generate a narrative extraction report with the LLM"""
         try:
             prompt = f"""
             Generate a detailed PAN card extraction report for the following results:
@@ -406,8 +607,8 @@ class PANExtractorAgent:
             Extraction Status: {extraction_result.get('status', 'Unknown')}
             Overall Confidence: {extraction_result.get('overall_confidence', 0):.2%}
             
-            Extracted Data: {json.dumps(extraction_result.get('extracted_data', {}), indent=2)}
-            Confidence Scores: {json.dumps(extraction_result.get('confidence_scores', {}), indent=2)}
+            Extracted Data: {json.dumps(extraction_result.get('extracted_data', {}), separators=(',', ':'), ensure_ascii=False)}
+            Confidence Scores: {json.dumps(extraction_result.get('confidence_scores', {}), separators=(',', ':'), ensure_ascii=False)}
             
             Provide a professional report including:
             1. Summary of extraction results
@@ -418,7 +619,7 @@ class PANExtractorAgent:
             """
             
             messages = [
-                SystemMessage(content=self.system_prompt),
+                self._system_msg,
                 HumanMessage(content=prompt)
             ]
             
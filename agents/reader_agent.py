@@ -8,12 +8,19 @@ import logging
 from typing import Dict, Any, List
 from datetime import datetime
 from langchain.agents import AgentExecutor, create_openai_functions_agent
-from langchain_openai import ChatOpenAI
 from langchain.prompts import ChatPromptTemplate, MessagesPlaceholder
 from langchain.schema import SystemMessage, HumanMessage
 from langchain.tools import BaseTool
 from config import Config
+from agents.llm_client import get_llm
 from utils.logging_config import setup_logging
+from utils.time_utils import iso_now
+
+# Required and optional fields per document type
+DOCUMENT_FIELDS = {
+    "AADHAAR": (("Aadhaar Number", "Name", "DOB", "Gender"), ("Address",)),
+    "PAN": (("PAN Number", "Name"), ("Father's Name", "DOB"))
+}
 
 class DataReaderTool(BaseTool):
     name: str = "Data Reader"
@@ -40,7 +47,7 @@ class DataReaderTool(BaseTool):
     def _analyze_data(self, data: Dict[str, Any]) -> Dict[str, Any]:
         """Analyze the extracted data for quality and completeness"""
         analysis = {
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": iso_now(),
             "document_type": data.get("document_type", "UNKNOWN"),
             "quality_score": 0,
             "completeness_score": 0,
@@ -51,15 +58,7 @@ class DataReaderTool(BaseTool):
         }
         
         # Calculate completeness score
-        if data.get("document_type") == "AADHAAR":
-            required_fields = ["Aadhaar Number", "Name", "DOB", "Gender"]
-            optional_fields = ["Address"]
-        elif data.get("document_type") == "PAN":
-            required_fields = ["PAN Number", "Name"]
-            optional_fields = ["Father's Name", "DOB"]
-        else:
-            required_fields = []
-            optional_fields = []
+        required_fields, optional_fields = DOCUMENT_FIELDS.get(data.get("document_type"), ((), ()))
         
         # Check required fields
         present_fields = []
@@ -85,8 +84,9 @@ class DataReaderTool(BaseTool):
         # Check for common OCR issues
         for field, value in data.items():
             if isinstance(value, str):
-                # Check for gibberish (too many repeated characters)
-                if len(set(value)) < len(value) * 0.3:
+                # Check for gibberish (too many repeated characters); values
+                # of 3 characters or fewer can never fall under the ratio
+                if len(value) > 3 and len(set(value)) < len(value) * 0.3:
                     quality_issues.append(f"Potential OCR issue in {field}: {value}")
                 
                 # Check for very short values
@@ -115,19 +115,27 @@ class DataReaderTool(BaseTool):
         analysis["recommendations"] = recommendations
         
         return analysis
+    
+    def analyze_batch(self, documents: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Analyze many documents in one call"""
+        return [self._analyze_data(data) for data in documents]
 
 class ReaderAgent:
     """Agent responsible for reading and analyzing validated document data"""
     
     def __init__(self):
         self.logger = setup_logging()
-        self.llm = ChatOpenAI(
-            model=Config.OPENAI_MODEL,
-            temperature=0.1,
-            api_key=Config.OPENAI_API_KEY
-        )
+        self.llm = get_llm()
         self.tools = [DataReaderTool()]
-        self.agent = self._create_agent()
+        # The LLM agent is only needed for narrative analyses, so build it on first use
+        self._agent = None
+    
+    @property
+    def agent(self):
+        """LLM agent executor, created on first use"""
+        if self._agent is None:
+            self._agent = self._create_agent()
+        return self._agent
     
     def _create_agent(self):
         """Create the reader agent"""
@@ -160,11 +168,22 @@ class ReaderAgent:
             handle_parsing_errors=True
         )
     
-    def read_data(self, data: Dict[str, Any]) -> Dict[str, Any]:
-        """Read and analyze the provided data"""
+    def read_data(self, data: Dict[str, Any], use_llm_narrative: bool = False) -> Dict[str, Any]:
+        """Read and analyze the provided data; use_llm_narrative asks the LLM agent for a written analysis"""
         try:
             self.logger.info("Reader Agent: Starting data analysis")
             
+            if not use_llm_narrative:
+                # The analysis is deterministic, so call the tool directly
+                # instead of routing through the LLM agent
+                analysis = self.tools[0]._analyze_data(data)
+                self.logger.info("Reader Agent: Data analysis completed")
+                return {
+                    "status": "success",
+                    "analysis": analysis,
+                    "timestamp": iso_now()
+                }
+            
             # Convert data to string for the tool
             data_str = json.dumps(data, indent=2)
             
@@ -188,7 +207,7 @@ class ReaderAgent:
             return {
                 "status": "success",
                 "analysis": result,
-                "timestamp": datetime.now().isoformat()
+                "timestamp": iso_now()
             }
             
         except Exception as e:
@@ -196,7 +215,7 @@ class ReaderAgent:
             return {
                 "status": "error",
                 "error_message": str(e),
-                "timestamp": datetime.now().isoformat()
+                "timestamp": iso_now()
             }
     
     def generate_report(self, data: Dict[str, Any], analysis: Dict[str, Any]) -> str:
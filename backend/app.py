@@ -6,12 +6,24 @@ Provides REST API endpoints for the React frontend
 
 import os
 import sys
+import re
 import json
-from flask import Flask, request, jsonify
+import shutil
+import atexit
+import multiprocessing
+import threading
+import queue
+import time
+from collections import OrderedDict
+from functools import lru_cache
+import orjson
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+from flask import Flask, Response, request
 from flask_cors import CORS
+from werkzeug.exceptions import RequestEntityTooLarge
 from werkzeug.utils import secure_filename
 import tempfile
-from datetime import datetime
 
 # Add parent directory to path to import our modules
 parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
@@ -19,67 +31,202 @@ sys.path.append(parent_dir)
 
 print(f"Looking for modules in: {parent_dir}")
 
-try:
-    from aadhaar_extractor_with_sql import AadhaarExtractionTool
-    print("✅ Successfully imported AadhaarExtractionTool")
-    from pan_extractor_with_sql import PANExtractionTool
-    print("✅ Successfully imported PANExtractionTool")
-    from user_management_demo import UserManagementSystem
-    print("✅ Successfully imported UserManagementSystem")
-except ImportError as e:
-    print(f"❌ Import error: {e}")
-    print(f"Current working directory: {os.getcwd()}")
-    print(f"Python path: {sys.path}")
-    print("Available files in parent directory:")
-    try:
-        for file in os.listdir(parent_dir):
-            if file.endswith('.py'):
-                print(f"  - {file}")
-    except:
-        pass
-    sys.exit(1)
+from utils.time_utils import iso_now
 
 app = Flask(__name__)
 CORS(app)  # Enable CORS for React frontend
 
 # Configuration
-UPLOAD_FOLDER = 'uploads'
-ALLOWED_EXTENSIONS = {'pdf', 'png', 'jpg', 'jpeg'}
+ALLOWED_EXTENSIONS = frozenset({'pdf', 'png', 'jpg', 'jpeg'})
+_ALLOWED_SUFFIXES = tuple('.' + ext for ext in ALLOWED_EXTENSIONS)
 MAX_FILE_SIZE = 16 * 1024 * 1024  # 16MB max file size
+UPLOAD_CHUNK_SIZE = 1024 * 1024  # Stream uploads to disk in 1MB chunks
+DISK_UPLOAD_FOLDER = 'uploads'
+TMPFS_ROOT = '/dev/shm'
+# tmpfs must fit several concurrent maximum-size uploads (Docker's default 64MB /dev/shm does not)
+TMPFS_MIN_FREE = 8 * MAX_FILE_SIZE
 
-# Ensure upload directory exists
-os.makedirs(UPLOAD_FOLDER, exist_ok=True)
+app.config['MAX_CONTENT_LENGTH'] = MAX_FILE_SIZE
 
-# Initialize extractors
-try:
-    print("🔧 Initializing extractors...")
-    aadhaar_extractor = AadhaarExtractionTool()
-    print("✅ Aadhaar extractor initialized")
-    
-    pan_extractor = PANExtractionTool()
-    print("✅ PAN extractor initialized")
-    
-    user_system = UserManagementSystem()
-    print("✅ User management system initialized")
+def _create_upload_folder():
+    """Return the upload directory, preferring a private tmpfs directory on Linux"""
+    # Uploads only live until extraction finishes, so keep them in memory when there is room
+    if sys.platform.startswith('linux') and os.path.isdir(TMPFS_ROOT):
+        stats = os.statvfs(TMPFS_ROOT)
+        if stats.f_bavail * stats.f_frsize >= TMPFS_MIN_FREE:
+            # mkdtemp creates a fresh 0700 directory, so other local users cannot read or replace uploads
+            folder = tempfile.mkdtemp(prefix='ocr_uploads_', dir=TMPFS_ROOT)
+            atexit.register(shutil.rmtree, folder, ignore_errors=True)
+            return folder
     
-except Exception as e:
-    print(f"❌ Failed to initialize extractors: {e}")
-    print("This might be due to missing dependencies or database issues")
-    # Continue anyway for basic API functionality
-    aadhaar_extractor = None
-    pan_extractor = None
-    user_system = None
+    os.makedirs(DISK_UPLOAD_FOLDER, exist_ok=True)
+    return DISK_UPLOAD_FOLDER
+
+UPLOAD_FOLDER = _create_upload_folder()
+
+# Extractors are imported and constructed on first use so non-OCR endpoints start fast
+@lru_cache(maxsize=None)
+def get_aadhaar_extractor():
+    """Return the shared Aadhaar extractor, or None if it cannot be loaded"""
+    try:
+        from aadhaar_extractor_with_sql import AadhaarExtractionTool
+        extractor = AadhaarExtractionTool()
+        print("✅ Aadhaar extractor initialized")
+        return extractor
+    except Exception as e:
+        print(f"❌ Failed to initialize Aadhaar extractor: {e}")
+        print("This might be due to missing dependencies or database issues")
+        return None
+
+@lru_cache(maxsize=None)
+def get_pan_extractor():
+    """Return the shared PAN extractor, or None if it cannot be loaded"""
+    try:
+        from pan_extractor_with_sql import PANExtractionTool
+        extractor = PANExtractionTool()
+        print("✅ PAN extractor initialized")
+        return extractor
+    except Exception as e:
+        print(f"❌ Failed to initialize PAN extractor: {e}")
+        print("This might be due to missing dependencies or database issues")
+        return None
+
+@lru_cache(maxsize=None)
+def get_user_system():
+    """Return the shared user management system, or None if it cannot be loaded"""
+    try:
+        from user_management_demo import UserManagementSystem
+        user_system = UserManagementSystem()
+        print("✅ User management system initialized")
+        return user_system
+    except Exception as e:
+        print(f"❌ Failed to initialize user management system: {e}")
+        print("This might be due to missing dependencies or database issues")
+        return None
+
+EXTRACTOR_GETTERS = {'AADHAAR': get_aadhaar_extractor, 'PAN': get_pan_extractor}
+EXTRACTOR_LABELS = {'AADHAAR': "Aadhaar", 'PAN': "PAN"}
+
+# Result status reported by a pool worker whose extractor could not be loaded
+EXTRACTOR_UNAVAILABLE = 'extractor_unavailable'
+
+def _init_worker():
+    """Construct extractors once per pool worker"""
+    for get_extractor in EXTRACTOR_GETTERS.values():
+        get_extractor()
+
+def _run_extract(document_type, filepath):
+    """Run extraction for a saved upload inside a pool worker"""
+    # Extractors only live in the pool workers, so availability is checked here
+    extractor = EXTRACTOR_GETTERS[document_type]()
+    if extractor is None:
+        return {'overall_status': EXTRACTOR_UNAVAILABLE}
+    return extractor.extract_and_store(filepath)
+
+# Every web worker process owns a pool, so split the cores between them
+EXTRACT_WORKERS = max(1, (os.cpu_count() or 1) // int(os.environ.get('WEB_CONCURRENCY', 1)))
+
+def _new_extract_pool():
+    """Create the process pool that runs OCR extraction"""
+    # Workers are spawned rather than forked since the web process runs request threads
+    return ProcessPoolExecutor(
+        max_workers=EXTRACT_WORKERS,
+        mp_context=multiprocessing.get_context('spawn'),
+        initializer=_init_worker
+    )
+
+# OCR is CPU-bound, so run it across cores instead of on the request thread
+EXTRACT_POOL = _new_extract_pool()
+_extract_pool_lock = threading.Lock()
+
+def _replace_extract_pool(broken_pool):
+    """Swap in a fresh pool after a worker died, unless another request already did"""
+    global EXTRACT_POOL
+    with _extract_pool_lock:
+        if EXTRACT_POOL is broken_pool:
+            print("⚠️ Extraction worker died; restarting the process pool")
+            EXTRACT_POOL = _new_extract_pool()
+            broken_pool.shutdown(wait=False)
+        return EXTRACT_POOL
+
+def _submit_extract(document_type, filepath):
+    """Queue an extraction, rebuilding the pool once if a crashed worker broke it"""
+    pool = EXTRACT_POOL
+    try:
+        return pool.submit(_run_extract, document_type, filepath)
+    except BrokenProcessPool:
+        return _replace_extract_pool(pool).submit(_run_extract, document_type, filepath)
+
+atexit.register(lambda: EXTRACT_POOL.shutdown())
+
+# Short-lived LRU of positive duplicate-check results keyed by (document type, normalized number).
+# Only "exists" answers are cached, since an insert handled by another gunicorn worker would not
+# evict a cached "does not exist". Rows removed by the user_management data cleanup migrator,
+# which may run in another process, can still be reported as existing for up to the TTL.
+DUPLICATE_CACHE_SIZE = 10000
+DUPLICATE_CACHE_TTL = 60  # seconds
+DOCUMENT_NUMBER_FIELDS = {'AADHAAR': 'Aadhaar Number', 'PAN': 'PAN Number'}
+_DOCUMENT_NUMBER_STRIP = re.compile(r'[^A-Z0-9]')
+_duplicate_cache = OrderedDict()
+_duplicate_cache_lock = threading.Lock()
+
+def _duplicate_cache_key(document_type, document_number):
+    """Build the duplicate cache key for a document number"""
+    return document_type, _DOCUMENT_NUMBER_STRIP.sub('', str(document_number).upper())
+
+def _duplicate_cache_get(key):
+    """Return a cached duplicate check result, or None if missing or expired"""
+    with _duplicate_cache_lock:
+        entry = _duplicate_cache.get(key)
+        if entry is None:
+            return None
+        expires_at, result = entry
+        if expires_at < time.monotonic():
+            del _duplicate_cache[key]
+            return None
+        _duplicate_cache.move_to_end(key)
+        return result
+
+def _duplicate_cache_put(key, result):
+    """Store a duplicate check result, evicting the least recently used entry"""
+    with _duplicate_cache_lock:
+        _duplicate_cache[key] = (time.monotonic() + DUPLICATE_CACHE_TTL, result)
+        _duplicate_cache.move_to_end(key)
+        if len(_duplicate_cache) > DUPLICATE_CACHE_SIZE:
+            _duplicate_cache.popitem(last=False)
+
+# Uploaded files are removed by a background thread, off the request path
+_cleanup_queue = queue.SimpleQueue()
+
+def _cleanup_worker():
+    """Delete processed upload files as they are queued"""
+    while True:
+        filepath = _cleanup_queue.get()
+        try:
+            os.remove(filepath)
+        except:
+            pass  # Ignore cleanup errors
+
+threading.Thread(target=_cleanup_worker, daemon=True).start()
 
 def allowed_file(filename):
     """Check if file extension is allowed"""
-    return '.' in filename and \
-           filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
+    return filename.lower().endswith(_ALLOWED_SUFFIXES)
+
+# Names made only of these characters come back from secure_filename unchanged
+_SAFE_FILENAME_RE = re.compile(r'[A-Za-z0-9-][A-Za-z0-9._-]*')
+
+def safe_filename(filename):
+    """Sanitize an upload name, skipping Werkzeug's normalization for names that are already safe"""
+    if os.name != 'nt' and _SAFE_FILENAME_RE.fullmatch(filename) and not filename.endswith(('.', '_')):
+        return filename
+    return secure_filename(filename)
 
 def format_response(success=True, message="", data=None, error=None):
     """Format standardized API response"""
     response = {
         'success': success,
-        'timestamp': datetime.now().isoformat(),
+        'timestamp': iso_now(),
         'message': message
     }
     
@@ -91,15 +238,28 @@ def format_response(success=True, message="", data=None, error=None):
     
     return response
 
+def _json(payload, status=200):
+    """Serialize a response payload with orjson"""
+    return Response(orjson.dumps(payload, default=str), status=status, mimetype='application/json')
+
+# Health payload is constant apart from the timestamp, so serialize it once
+_HEALTH_PAYLOAD_BYTES = orjson.dumps({
+    'success': True,
+    'message': "API is running",
+    'data': {'status': 'healthy', 'version': '1.0.0'}
+})
+_HEALTH_PREFIX = _HEALTH_PAYLOAD_BYTES[:-1] + b',"timestamp":'
+
 @app.route('/', methods=['GET'])
 def root():
     """Root endpoint"""
-    return jsonify(format_response(
+    return _json(format_response(
         success=True,
         message="Document Processing API is running",
         data={'status': 'healthy', 'version': '1.0.0', 'endpoints': [
             '/api/health',
             '/api/upload',
+            '/api/upload_batch',
             '/api/check-duplicate',
             '/api/stats'
         ]}
@@ -108,11 +268,8 @@ def root():
 @app.route('/api/health', methods=['GET'])
 def health_check():
     """Health check endpoint"""
-    return jsonify(format_response(
-        success=True,
-        message="API is running",
-        data={'status': 'healthy', 'version': '1.0.0'}
-    ))
+    body = _HEALTH_PREFIX + orjson.dumps(iso_now()) + b'}'
+    return Response(body, mimetype='application/json')
 
 @app.route('/api/upload', methods=['POST'])
 def upload_document():
@@ -120,68 +277,64 @@ def upload_document():
     try:
         # Check if file is present
         if 'file' not in request.files:
-            return jsonify(format_response(
+            return _json(format_response(
                 success=False,
                 message="No file provided",
                 error="FILE_MISSING"
-            )), 400
+            ), 400)
         
         file = request.files['file']
         document_type = request.form.get('documentType', 'AADHAAR').upper()
         
         # Check if file is selected
         if file.filename == '':
-            return jsonify(format_response(
+            return _json(format_response(
                 success=False,
                 message="No file selected",
                 error="FILE_NOT_SELECTED"
-            )), 400
+            ), 400)
         
         # Validate file type
         if not allowed_file(file.filename):
-            return jsonify(format_response(
+            return _json(format_response(
                 success=False,
                 message="Invalid file type. Only PDF, PNG, JPG, JPEG allowed",
                 error="INVALID_FILE_TYPE"
-            )), 400
+            ), 400)
+        
+        # Validate the document type before touching disk
+        if document_type not in EXTRACTOR_GETTERS:
+            return _json(format_response(
+                success=False,
+                message="Invalid document type. Use AADHAAR or PAN",
+                error="INVALID_DOCUMENT_TYPE"
+            ), 400)
         
         # Save uploaded file temporarily
-        filename = secure_filename(file.filename)
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        unique_filename = f"{timestamp}_{filename}"
+        filename = safe_filename(file.filename)
+        timestamp = time.strftime("%Y%m%d_%H%M%S")
+        unique_filename = f"{timestamp}_{os.urandom(4).hex()}_{filename}"
         filepath = os.path.join(UPLOAD_FOLDER, unique_filename)
         
-        file.save(filepath)
-        
-        # Check if extractors are available
-        if document_type == 'AADHAAR' and aadhaar_extractor is None:
-            return jsonify(format_response(
-                success=False,
-                message="Aadhaar extractor not available. Please check server setup.",
-                error="EXTRACTOR_NOT_AVAILABLE"
-            )), 503
-        
-        if document_type == 'PAN' and pan_extractor is None:
-            return jsonify(format_response(
-                success=False,
-                message="PAN extractor not available. Please check server setup.",
-                error="EXTRACTOR_NOT_AVAILABLE"
-            )), 503
+        with open(filepath, 'wb') as fh:
+            shutil.copyfileobj(file.stream, fh, length=UPLOAD_CHUNK_SIZE)
         
         # Process document based on type
         print(f"🔄 Processing {document_type} document: {filepath}")
         print(f"📁 File size: {os.path.getsize(filepath)} bytes")
         
-        if document_type == 'AADHAAR':
-            result = aadhaar_extractor.extract_and_store(filepath)
-        elif document_type == 'PAN':
-            result = pan_extractor.extract_and_store(filepath)
-        else:
-            return jsonify(format_response(
+        try:
+            result = _submit_extract(document_type, filepath).result()
+        finally:
+            # Clean up uploaded file, even when the extraction worker failed
+            _cleanup_queue.put(filepath)
+        
+        if result.get('overall_status') == EXTRACTOR_UNAVAILABLE:
+            return _json(format_response(
                 success=False,
-                message="Invalid document type. Use AADHAAR or PAN",
-                error="INVALID_DOCUMENT_TYPE"
-            )), 400
+                message=f"{EXTRACTOR_LABELS[document_type]} extractor not available. Please check server setup.",
+                error="EXTRACTOR_NOT_AVAILABLE"
+            ), 503)
         
         print(f"📊 Processing result: {result.get('overall_status', 'unknown')}")
         print(f"📊 Full result keys: {list(result.keys())}")
@@ -201,17 +354,11 @@ def upload_document():
             if 'error_message' in storage:
                 print(f"📊 Storage error message: {storage.get('error_message', '')}")
         
-        # Clean up uploaded file
-        try:
-            os.remove(filepath)
-        except:
-            pass  # Ignore cleanup errors
-        
         # Format response based on processing result
         if result.get('overall_status') == 'success':
             extracted_data = result.get('extraction', {}).get('extracted_data', {})
             
-            return jsonify(format_response(
+            return _json(format_response(
                 success=True,
                 message="Document processed successfully",
                 data={
@@ -225,7 +372,7 @@ def upload_document():
         
         elif result.get('overall_status') == 'duplicate_rejected':
             # Handle duplicate as a special case, not an error
-            return jsonify(format_response(
+            return _json(format_response(
                 success=False,
                 message="Duplicate document detected - this Aadhaar/PAN already exists in the system",
                 error="DUPLICATE_DOCUMENT",
@@ -236,7 +383,7 @@ def upload_document():
                     'extractedFields': result.get('extraction', {}).get('extracted_data', {}),
                     'confidence': result.get('extraction', {}).get('extraction_confidence', 0)
                 }
-            )), 409
+            ), 409)
         
         else:
             # Check if extraction was successful but storage failed
@@ -246,7 +393,7 @@ def upload_document():
                 extracted_data = result.get('extraction', {}).get('extracted_data', {})
                 storage_error = result.get('storage', {}).get('error_message', 'Storage failed')
                 
-                return jsonify(format_response(
+                return _json(format_response(
                     success=False,
                     message=f"Document extracted successfully but storage failed: {storage_error}",
                     error="STORAGE_FAILED",
@@ -256,22 +403,121 @@ def upload_document():
                         'confidence': result.get('extraction', {}).get('extraction_confidence', 0),
                         'storageError': storage_error
                     }
-                )), 500
+                ), 500)
             else:
                 # Extraction itself failed
                 error_message = result.get('extraction', {}).get('error_message', 'Document extraction failed')
-                return jsonify(format_response(
+                return _json(format_response(
                     success=False,
                     message=error_message,
                     error="EXTRACTION_FAILED"
-                )), 500
+                ), 500)
+    
+    except RequestEntityTooLarge:
+        raise  # Let Flask answer with 413
     
     except Exception as e:
-        return jsonify(format_response(
+        return _json(format_response(
             success=False,
             message=f"Server error: {str(e)}",
             error="SERVER_ERROR"
-        )), 500
+        ), 500)
+
+@app.route('/api/upload_batch', methods=['POST'])
+def upload_batch():
+    """Upload and process several documents in parallel"""
+    try:
+        files = request.files.getlist('files')
+        document_type = request.form.get('documentType', 'AADHAAR').upper()
+        
+        if not files:
+            return _json(format_response(
+                success=False,
+                message="No files provided",
+                error="FILE_MISSING"
+            ), 400)
+        
+        if document_type not in EXTRACTOR_GETTERS:
+            return _json(format_response(
+                success=False,
+                message="Invalid document type. Use AADHAAR or PAN",
+                error="INVALID_DOCUMENT_TYPE"
+            ), 400)
+        
+        batch_prefix = f"{time.strftime('%Y%m%d_%H%M%S')}_{os.urandom(4).hex()}"
+        futures = {}
+        filepaths = []
+        results = []
+        
+        try:
+            for index, file in enumerate(files):
+                if file.filename == '' or not allowed_file(file.filename):
+                    results.append({
+                        'filename': file.filename,
+                        'status': 'rejected',
+                        'error': "INVALID_FILE_TYPE"
+                    })
+                    continue
+                
+                filename = safe_filename(file.filename)
+                filepath = os.path.join(UPLOAD_FOLDER, f"{batch_prefix}_{index}_{filename}")
+                filepaths.append(filepath)
+                with open(filepath, 'wb') as fh:
+                    shutil.copyfileobj(file.stream, fh, length=UPLOAD_CHUNK_SIZE)
+                
+                try:
+                    futures[_submit_extract(document_type, filepath)] = file.filename
+                except Exception as e:
+                    results.append({
+                        'filename': file.filename,
+                        'status': 'failed',
+                        'error': str(e)
+                    })
+            
+            # Collect results in completion order
+            for future in as_completed(futures):
+                filename = futures[future]
+                try:
+                    result = future.result()
+                    results.append({
+                        'filename': filename,
+                        'status': result.get('overall_status', 'unknown'),
+                        'extractedFields': result.get('extraction', {}).get('extracted_data', {}),
+                        'userId': result.get('user_id'),
+                        'confidence': result.get('extraction', {}).get('extraction_confidence', 0)
+                    })
+                except Exception as e:
+                    results.append({
+                        'filename': filename,
+                        'status': 'failed',
+                        'error': str(e)
+                    })
+        finally:
+            # Remove every saved upload, including partial writes and files of a
+            # batch abandoned by an error; extractions not yet started are dropped
+            for future in futures:
+                future.cancel()
+            for filepath in filepaths:
+                _cleanup_queue.put(filepath)
+        
+        return _json(format_response(
+            success=True,
+            message=f"Processed {len(results)} documents",
+            data={
+                'documentType': document_type,
+                'results': results
+            }
+        ))
+    
+    except RequestEntityTooLarge:
+        raise  # Let Flask answer with 413
+    
+    except Exception as e:
+        return _json(format_response(
+            success=False,
+            message=f"Server error: {str(e)}",
+            error="SERVER_ERROR"
+        ), 500)
 
 @app.route('/api/check-duplicate', methods=['POST'])
 def check_duplicate():
@@ -282,25 +528,31 @@ def check_duplicate():
         document_type = data.get('documentType', 'AADHAAR').upper()
         
         if not document_number:
-            return jsonify(format_response(
+            return _json(format_response(
                 success=False,
                 message="Document number is required",
                 error="MISSING_DOCUMENT_NUMBER"
-            )), 400
+            ), 400)
         
-        # Check for existing document
-        if document_type == 'AADHAAR':
-            result = aadhaar_extractor.check_aadhaar_exists(document_number)
-        elif document_type == 'PAN':
-            result = pan_extractor.check_pan_exists(document_number)
-        else:
-            return jsonify(format_response(
+        if document_type not in DOCUMENT_NUMBER_FIELDS:
+            return _json(format_response(
                 success=False,
                 message="Invalid document type",
                 error="INVALID_DOCUMENT_TYPE"
-            )), 400
+            ), 400)
         
-        return jsonify(format_response(
+        # Check for existing document, reusing a recent answer when available
+        cache_key = _duplicate_cache_key(document_type, document_number)
+        result = _duplicate_cache_get(cache_key)
+        if result is None:
+            if document_type == 'AADHAAR':
+                result = get_aadhaar_extractor().check_aadhaar_exists(document_number)
+            else:
+                result = get_pan_extractor().check_pan_exists(document_number)
+            if result.get('exists'):
+                _duplicate_cache_put(cache_key, result)
+        
+        return _json(format_response(
             success=True,
             message="Duplicate check completed",
             data={
@@ -312,81 +564,82 @@ def check_duplicate():
         ))
     
     except Exception as e:
-        return jsonify(format_response(
+        return _json(format_response(
             success=False,
             message=f"Server error: {str(e)}",
             error="SERVER_ERROR"
-        )), 500
+        ), 500)
 
 @app.route('/api/stats', methods=['GET'])
 def get_statistics():
     """Get system statistics"""
     try:
-        stats = user_system.get_system_statistics()
+        stats = get_user_system().get_system_statistics()
         
-        return jsonify(format_response(
+        return _json(format_response(
             success=True,
             message="Statistics retrieved successfully",
             data=stats
         ))
     
     except Exception as e:
-        return jsonify(format_response(
+        return _json(format_response(
             success=False,
             message=f"Failed to get statistics: {str(e)}",
             error="STATS_ERROR"
-        )), 500
+        ), 500)
 
 @app.route('/api/user/<user_id>/documents', methods=['GET'])
 def get_user_documents(user_id):
     """Get all documents for a specific user"""
     try:
-        documents = user_system.get_user_documents(user_id)
+        documents = get_user_system().get_user_documents(user_id)
         
-        return jsonify(format_response(
+        return _json(format_response(
             success=True,
             message="User documents retrieved successfully",
             data=documents
         ))
     
     except Exception as e:
-        return jsonify(format_response(
+        return _json(format_response(
             success=False,
             message=f"Failed to get user documents: {str(e)}",
             error="USER_DOCS_ERROR"
-        )), 500
+        ), 500)
 
 @app.errorhandler(413)
 def too_large(e):
     """Handle file too large error"""
-    return jsonify(format_response(
+    return _json(format_response(
         success=False,
         message="File too large. Maximum size is 16MB",
         error="FILE_TOO_LARGE"
-    )), 413
+    ), 413)
 
 @app.errorhandler(404)
 def not_found(e):
     """Handle 404 errors"""
-    return jsonify(format_response(
+    return _json(format_response(
         success=False,
         message="Endpoint not found",
         error="NOT_FOUND"
-    )), 404
+    ), 404)
 
 @app.errorhandler(500)
 def internal_error(e):
     """Handle 500 errors"""
-    return jsonify(format_response(
+    return _json(format_response(
         success=False,
         message="Internal server error",
         error="INTERNAL_ERROR"
-    )), 500
+    ), 500)
 
 if __name__ == '__main__':
     print("🚀 Starting Flask Backend Server...")
     
     # Initialize system on startup if available
+    user_system = get_user_system()
     if user_system is not None:
         print("🔧 Initializing User Management System...")
         try:
@@ -406,5 +659,9 @@ if __name__ == '__main__':
         print("⚠️ User Management System not available")
         print("🔄 Starting server with basic functionality...")
     
+    # Start the pool workers now so their extractors are built before the first upload
+    for _ in range(EXTRACT_WORKERS):
+        EXTRACT_POOL.submit(int)
+    
     print("🌐 Starting Flask server on http://localhost:5000")
-    app.run(debug=True, host='0.0.0.0', port=5000)
\ No newline at end of file
+    app.run(debug=bool(os.environ.get('FLASK_DEBUG')), host='0.0.0.0', port=5000)
\ No newline at end of file
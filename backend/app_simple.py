@@ -6,23 +6,18 @@ Bypasses user management system to isolate storage issues
 
 import os
 import sys
+import shutil
+from functools import lru_cache
 from flask import Flask, request, jsonify
 from flask_cors import CORS
+from werkzeug.exceptions import RequestEntityTooLarge
 from datetime import datetime
 import sqlite3
 
 # Add the parent directory to path for imports
 sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
 
-# Import extractors
-try:
-    from aadhaar_extractor_simple import SimpleAadhaarExtractionTool
-    from pan_extractor_with_sql import PANExtractionTool
-    print("✅ Successfully imported extractors")
-except Exception as e:
-    print(f"❌ Error importing extractors: {e}")
-    SimpleAadhaarExtractionTool = None
-    PANExtractionTool = None
+from utils.time_utils import iso_now
 
 app = Flask(__name__)
 CORS(app)
@@ -30,31 +25,51 @@ CORS(app)
 # Configuration
 UPLOAD_FOLDER = 'uploads'
 MAX_CONTENT_LENGTH = 16 * 1024 * 1024  # 16MB max file size
+UPLOAD_CHUNK_SIZE = 1024 * 1024  # Stream uploads to disk in 1MB chunks
+
+app.config['MAX_CONTENT_LENGTH'] = MAX_CONTENT_LENGTH
 
 # Ensure upload folder exists
 os.makedirs(UPLOAD_FOLDER, exist_ok=True)
 
-# Initialize extractors
-aadhaar_extractor = None
-pan_extractor = None
-
-try:
-    if SimpleAadhaarExtractionTool:
-        aadhaar_extractor = SimpleAadhaarExtractionTool()
+# Extractors are imported and constructed on first use
+@lru_cache(maxsize=None)
+def get_aadhaar_extractor():
+    """Return the Aadhaar extractor, or None if it cannot be loaded"""
+    try:
+        from aadhaar_extractor_simple import SimpleAadhaarExtractionTool
+        extractor = SimpleAadhaarExtractionTool()
         print("✅ Aadhaar extractor initialized")
-    
-    if PANExtractionTool:
-        pan_extractor = PANExtractionTool()
+        return extractor
+    except Exception as e:
+        print(f"❌ Error initializing Aadhaar extractor: {e}")
+        return None
+
+@lru_cache(maxsize=None)
+def get_pan_extractor():
+    """Return the PAN extractor, or None if it cannot be loaded"""
+    try:
+        from pan_extractor_with_sql import PANExtractionTool
+        extractor = PANExtractionTool()
         print("✅ PAN extractor initialized")
-except Exception as e:
-    print(f"❌ Error initializing extractors: {e}")
+        return extractor
+    except Exception as e:
+        print(f"❌ Error initializing PAN extractor: {e}")
+        return None
+
+EXTRACTOR_GETTERS = {'AADHAAR': get_aadhaar_extractor, 'PAN': get_pan_extractor}
+EXTRACTOR_LABELS = {'AADHAAR': "Aadhaar", 'PAN': "PAN"}
+
+def _extractor_loaded(get_extractor):
+    """Report whether an extractor has already been built successfully, without building it"""
+    return get_extractor.cache_info().currsize > 0 and get_extractor() is not None
 
 def format_response(success=True, message="", data=None, error=None):
     """Format API response"""
     response = {
         "success": success,
         "message": message,
-        "timestamp": datetime.now().isoformat()
+        "timestamp": iso_now()
     }
     
     if data is not None:
@@ -72,9 +87,9 @@ def health_check():
         success=True,
         message="Backend is running",
         data={
-            'aadhaar_extractor': aadhaar_extractor is not None,
-            'pan_extractor': pan_extractor is not None,
-            'timestamp': datetime.now().isoformat()
+            'aadhaar_extractor': _extractor_loaded(get_aadhaar_extractor),
+            'pan_extractor': _extractor_loaded(get_pan_extractor),
+            'timestamp': iso_now()
         }
     ))
 
@@ -100,42 +115,36 @@ def upload_document():
             )), 400
         
         if file:
-            # Save file temporarily
-            filename = file.filename
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            unique_filename = f"{timestamp}_{filename}"
-            filepath = os.path.join(UPLOAD_FOLDER, unique_filename)
-            
-            file.save(filepath)
-            
-            # Check if extractors are available
-            if document_type == 'AADHAAR' and aadhaar_extractor is None:
+            # Resolve the extractor before touching disk
+            get_extractor = EXTRACTOR_GETTERS.get(document_type)
+            if get_extractor is None:
                 return jsonify(format_response(
                     success=False,
-                    message="Aadhaar extractor not available",
-                    error="EXTRACTOR_NOT_AVAILABLE"
-                )), 503
+                    message="Invalid document type. Use AADHAAR or PAN",
+                    error="INVALID_DOCUMENT_TYPE"
+                )), 400
             
-            if document_type == 'PAN' and pan_extractor is None:
+            extractor = get_extractor()
+            if extractor is None:
                 return jsonify(format_response(
                     success=False,
-                    message="PAN extractor not available",
+                    message=f"{EXTRACTOR_LABELS[document_type]} extractor not available",
                     error="EXTRACTOR_NOT_AVAILABLE"
                 )), 503
             
+            # Save file temporarily
+            filename = file.filename
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            unique_filename = f"{timestamp}_{filename}"
+            filepath = os.path.join(UPLOAD_FOLDER, unique_filename)
+            
+            with open(filepath, 'wb') as fh:
+                shutil.copyfileobj(file.stream, fh, length=UPLOAD_CHUNK_SIZE)
+            
             # Process document
             print(f"🔄 Processing {document_type} document: {filepath}")
             
-            if document_type == 'AADHAAR':
-                result = aadhaar_extractor.extract_and_store(filepath)
-            elif document_type == 'PAN':
-                result = pan_extractor.extract_and_store(filepath)
-            else:
-                return jsonify(format_response(
-                    success=False,
-                    message="Invalid document type. Use AADHAAR or PAN",
-                    error="INVALID_DOCUMENT_TYPE"
-                )), 400
+            result = extractor.extract_and_store(filepath)
             
             print(f"📊 Processing result: {result.get('overall_status', 'unknown')}")
             
@@ -198,6 +207,9 @@ def upload_document():
                         error="EXTRACTION_FAILED"
                     )), 500
     
+    except RequestEntityTooLarge:
+        raise  # Let Flask answer with 413
+    
     except Exception as e:
         print(f"❌ Error in upload_document: {e}")
         return jsonify(format_response(
@@ -213,13 +225,13 @@ def get_statistics():
         success=True,
         message="Statistics retrieved successfully",
         data={
-            'aadhaar_extractor': aadhaar_extractor is not None,
-            'pan_extractor': pan_extractor is not None,
-            'timestamp': datetime.now().isoformat()
+            'aadhaar_extractor': _extractor_loaded(get_aadhaar_extractor),
+            'pan_extractor': _extractor_loaded(get_pan_extractor),
+            'timestamp': iso_now()
         }
     ))
 
 if __name__ == '__main__':
     print("🚀 Starting Simplified Flask Backend Server...")
     print("🌐 Starting Flask server on http://localhost:5000")
-    app.run(debug=True, host='0.0.0.0', port=5000)
+    app.run(debug=bool(os.environ.get('FLASK_DEBUG')), host='0.0.0.0', port=5000)
@@ -0,0 +1,22 @@
+"""
+Gunicorn configuration for the document processing backend
+OCR runs in each worker's process pool, so request workers use threads
+"""
+
+import os
+
+bind = os.environ.get('BIND', '0.0.0.0:5000')
+chdir = os.path.dirname(os.path.abspath(__file__))
+
+# Threaded workers mostly wait on the OCR pool, so a few processes with many threads suffice
+worker_class = 'gthread'
+# Exported so each worker's app sizes its OCR pool to its share of the cores
+workers = int(os.environ.setdefault('WEB_CONCURRENCY', '2'))
+threads = int(os.environ.get('GUNICORN_THREADS', (os.cpu_count() or 1) * 4))
+keepalive = 30
+
+# Extraction can take a while on large PDFs
+timeout = 300
+
+# Each worker imports the app itself so its cleanup thread and OCR pool are created after fork
+preload_app = False
@@ -1,12 +1,28 @@
 # batch_process.py
 import os
-import json
-from pathlib import Path
+import orjson
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
-from graph.workflow import process_batch_with_graph
+from graph.workflow import iter_batch_with_graph, process_document_with_graph
 from utils.logging_config import setup_logging
 from config import Config
 
+# Below this many files the pool startup costs more than it saves
+PARALLEL_MIN_FILES = 4
+POOL_CHUNKSIZE = 4
+
+def iter_batch_results(file_paths: list, logger):
+    """Yield results for each file, fanning out across cores for larger batches"""
+    if len(file_paths) < PARALLEL_MIN_FILES:
+        yield from iter_batch_with_graph(file_paths)
+        return
+    
+    with ProcessPoolExecutor(max_workers=os.cpu_count()) as executor:
+        results = executor.map(process_document_with_graph, file_paths, chunksize=POOL_CHUNKSIZE)
+        for processed, result in enumerate(results, 1):
+            logger.info(f"Processed {processed}/{len(file_paths)} files")
+            yield result
+
 def process_batch(input_directory: str, output_file: str = None):
     """Process all PDF files in a directory and save results"""
     
@@ -19,8 +35,10 @@ def process_batch(input_directory: str, output_file: str = None):
     
     # Find all PDF files
     pdf_files = []
-    for ext in ['*.pdf', '*.PDF']:
-        pdf_files.extend(Path(input_directory).glob(f"**/{ext}"))
+    for root, _, files in os.walk(input_directory):
+        for name in files:
+            if name.lower().endswith('.pdf'):
+                pdf_files.append(os.path.join(root, name))
     
     if not pdf_files:
         logger.warning(f"No PDF files found in: {input_directory}")
@@ -28,33 +46,47 @@ def process_batch(input_directory: str, output_file: str = None):
     
     logger.info(f"Found {len(pdf_files)} PDF files to process")
     
-    # Process files using LangGraph
+    # Process files using LangGraph, writing each result as a JSON line
     try:
-        results = process_batch_with_graph([str(f) for f in pdf_files])
+        total_files = 0
+        successful = 0
         
-        # Calculate statistics
-        total_files = len(results)
-        successful = len([r for r in results if r.get('validation_status') == 'passed'])
-        failed = total_files - successful
-        success_rate = (successful / total_files * 100) if total_files > 0 else 0
-        
-        # Create summary
-        summary = {
-            "processing_timestamp": datetime.now().isoformat(),
-            "input_directory": input_directory,
-            "total_files": total_files,
-            "successful": successful,
-            "failed": failed,
-            "success_rate": round(success_rate, 2),
-            "results": results
-        }
-        
-        # Save results
         if output_file:
-            os.makedirs(os.path.dirname(output_file), exist_ok=True)
-            with open(output_file, 'w', encoding='utf-8') as f:
-                json.dump(summary, f, indent=2, ensure_ascii=False)
-            logger.info(f"Results saved to: {output_file}")
+            os.makedirs(os.path.dirname(output_file) or '.', exist_ok=True)
+            out = open(output_file, 'wb')
+        else:
+            out = None
+        
+        try:
+            for result in iter_batch_results(pdf_files, logger):
+                total_files += 1
+                if result.get('validation_status') == 'passed':
+                    successful += 1
+                if out:
+                    out.write(orjson.dumps(result, default=str))
+                    out.write(b"\n")
+            
+            # Calculate statistics
+            failed = total_files - successful
+            success_rate = (successful / total_files * 100) if total_files > 0 else 0
+            
+            # Summary is written as the last line
+            summary = {
+                "processing_timestamp": datetime.now().isoformat(),
+                "input_directory": input_directory,
+                "total_files": total_files,
+                "successful": successful,
+                "failed": failed,
+                "success_rate": round(success_rate, 2)
+            }
+            
+            if out:
+                out.write(orjson.dumps({"summary": summary}))
+                out.write(b"\n")
+                logger.info(f"Results saved to: {output_file}")
+        finally:
+            if out:
+                out.close()
         
         # Print summary
         print(f"\n📊 BATCH PROCESSING SUMMARY:")
@@ -75,7 +107,7 @@ def main():
     
     parser = argparse.ArgumentParser(description='Batch process PDF documents')
     parser.add_argument('input_dir', help='Input directory containing PDF files')
-    parser.add_argument('--output', '-o', help='Output JSON file for results')
+    parser.add_argument('--output', '-o', help='Output JSON Lines file for results')
     parser.add_argument('--verbose', '-v', action='store_true', help='Enable verbose logging')
     
     args = parser.parse_args()
@@ -83,7 +115,7 @@ def main():
     # Set up output file
     if not args.output:
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        args.output = os.path.join(Config.OUTPUT_DIR, f"batch_results_{timestamp}.json")
+        args.output = os.path.join(Config.OUTPUT_DIR, f"batch_results_{timestamp}.jsonl")
     
     # Process batch
     success = process_batch(args.input_dir, args.output)
@@ -20,28 +20,40 @@ def check_database_schema(db_path):
         with sqlite3.connect(db_path) as conn:
             cursor = conn.cursor()
             
-            # Get all tables
-            cursor.execute("SELECT name FROM sqlite_master WHERE type='table'")
-            tables = cursor.fetchall()
+            # Read-only inspection; let reads go through mmap
+            cursor.execute("PRAGMA query_only=1")
+            cursor.execute("PRAGMA mmap_size=268435456")
+            
+            # Get all tables and their columns in one query
+            cursor.execute("""
+                SELECT m.name, p.name, p.type, p."notnull", p.pk
+                FROM sqlite_master m, pragma_table_info(m.name) p
+                WHERE m.type='table'
+                ORDER BY m.rowid, p.cid
+            """)
+            tables = {}
+            for table_name, col_name, col_type, not_null, pk in cursor.fetchall():
+                tables.setdefault(table_name, []).append((col_name, col_type, not_null, pk))
+            
+            # Get all row counts in one query
+            counts = {}
+            if tables:
+                count_sql = " UNION ALL ".join(
+                    "SELECT ?, COUNT(*) FROM \"{}\"".format(name.replace('"', '""'))
+                    for name in tables
+                )
+                cursor.execute(count_sql, list(tables))
+                counts = dict(cursor.fetchall())
             
             print(f"📋 Tables found: {len(tables)}")
-            for table in tables:
-                table_name = table[0]
+            for table_name, columns in tables.items():
                 print(f"\n📄 Table: {table_name}")
                 
-                # Get table schema
-                cursor.execute(f"PRAGMA table_info({table_name})")
-                columns = cursor.fetchall()
-                
                 print("  Columns:")
-                for col in columns:
-                    col_id, col_name, col_type, not_null, default_val, pk = col
+                for col_name, col_type, not_null, pk in columns:
                     print(f"    - {col_name} ({col_type}){' PRIMARY KEY' if pk else ''}{' NOT NULL' if not_null else ''}")
                 
-                # Get row count
-                cursor.execute(f"SELECT COUNT(*) FROM {table_name}")
-                count = cursor.fetchone()[0]
-                print(f"  Row count: {count}")
+                print(f"  Row count: {counts[table_name]}")
                 
     except Exception as e:
         print(f"❌ Error checking {db_path}: {e}")
@@ -9,9 +9,12 @@ Complete Pipeline Integration: Extractor Agent → Validator Agent → Database
 
 import sys
 import os
-import json
+import orjson
 import sqlite3
-from datetime import datetime
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from pathlib import Path
 
 # Add the project root to the path
@@ -20,128 +23,314 @@ sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 from agents.validator_agent import FieldValidator
 from tools.pdf_extractor_tool import PDFExtractorTool
 
+# Field name variants stored under one field_name in field_validations
+FIELD_ALIASES = {
+    "Date of Birth": "DOB",
+    "PAN": "PAN Number",
+}
+
+FIELD_VALIDATORS = {
+    "Aadhaar Number": FieldValidator.validate_aadhaar_number,
+    "Name": FieldValidator.validate_name,
+    "DOB": FieldValidator.validate_date,
+    "Gender": FieldValidator.validate_gender,
+    "Address": FieldValidator.validate_address,
+    "PAN Number": FieldValidator.validate_pan_number,
+}
+FIELD_VALIDATORS.update({alias: FIELD_VALIDATORS[field] for alias, field in FIELD_ALIASES.items()})
+
+
+# view_document_details keys for the known fields; other fields keep their own name
+DETAIL_KEYS = {
+    "Aadhaar Number": "aadhaar",
+    "Name": "name",
+    "DOB": "dob",
+    "Gender": "gender",
+    "Address": "address",
+    "PAN Number": "pan",
+}
+
+
+def _canonical_fields(fields: dict) -> dict:
+    """Expose aliased fields under their canonical name; an explicit canonical entry wins"""
+    canonical = {FIELD_ALIASES[name]: value for name, value in fields.items() if name in FIELD_ALIASES}
+    canonical.update(fields)
+    return canonical
+
+
+def _field_extra(field_result: dict):
+    """Serialize the validator's field-specific keys (type, length, parsed_date, ...) for the extra column"""
+    extra = {key: value for key, value in field_result.items() if key not in ("valid", "reason")}
+    return orjson.dumps(extra, default=str).decode() if extra else None
+
+
+def _validate_generic_field(field_value) -> dict:
+    """Generic validation for unknown fields"""
+    if isinstance(field_value, str):
+        # isspace() answers "blank after strip" without building a stripped copy
+        is_valid = bool(field_value) and not field_value.isspace()
+    else:
+        is_valid = bool(field_value and str(field_value).strip())
+    return {
+        "valid": is_valid,
+        "type": "generic",
+        "reason": "present" if field_value else "missing"
+    }
+
+
 class CompletePipelineProcessor:
     """Complete pipeline processor that handles the entire workflow"""
     
-    def __init__(self, db_path: str = "ocr_documents.db"):
+    # Statements are kept identical across calls so sqlite3 reuses its prepared statements;
+    # single-line ones keep the statement cache keys short
+    
+    # SQLite 3.45+ stores the documents JSON columns as binary JSONB; json() reads
+    # them, and TEXT rows written by older versions, back as JSON text
+    JSONB_SUPPORTED = sqlite3.sqlite_version_info >= (3, 45, 0)
+    JSON_PARAM = "jsonb(?)" if JSONB_SUPPORTED else "?"
+    JSON_COLUMN = "json({})" if JSONB_SUPPORTED else "{}"
+    
+    INSERT_DOCUMENT_SQL = (
+        "INSERT INTO documents (file_path, document_type, extraction_confidence, validation_status, is_valid, "
+        "overall_score, error_count, warning_count, extracted_data, validation_errors, validation_warnings) "
+        f"VALUES (?, ?, ?, ?, ?, ?, ?, ?, {JSON_PARAM}, {JSON_PARAM}, {JSON_PARAM})"
+    )
+    
+    # SQLite 3.35+ hands the new id back from the INSERT itself
+    RETURNING_SUPPORTED = sqlite3.sqlite_version_info >= (3, 35, 0)
+    if RETURNING_SUPPORTED:
+        INSERT_DOCUMENT_SQL += " RETURNING id"
+    
+    INSERT_FIELD_VALIDATION_SQL = (
+        "INSERT INTO field_validations (document_id, field_name, value, valid, reason, extra) "
+        "VALUES (?, ?, ?, ?, ?, ?)"
+    )
+    
+    SUMMARY_TOTALS_SQL = (
+        "SELECT COUNT(*), COALESCE(SUM(is_valid = 1), 0), AVG(overall_score), AVG(extraction_confidence) FROM documents"
+    )
+    SUMMARY_TYPES_SQL = "SELECT document_type, COUNT(*) FROM documents GROUP BY document_type"
+    RECENT_DOCUMENTS_SQL = (
+        "SELECT id, file_path, validation_status, overall_score, processed_at "
+        "FROM documents ORDER BY processed_at DESC LIMIT 5"
+    )
+    SELECT_DOCUMENT_SQL = (
+        "SELECT id, file_path, document_type, extraction_confidence, validation_status, is_valid, "
+        "overall_score, error_count, warning_count, "
+        f"{JSON_COLUMN.format('extracted_data')}, {JSON_COLUMN.format('validation_errors')}, "
+        f"{JSON_COLUMN.format('validation_warnings')}, processed_at "
+        "FROM documents WHERE id = ?"
+    )
+    SELECT_FIELD_VALIDATIONS_SQL = "SELECT field_name, value, valid, reason FROM field_validations WHERE document_id = ?"
+    SELECT_LOGS_SQL = (
+        "SELECT agent_name, action, status, processing_time_ms, timestamp "
+        "FROM processing_logs WHERE document_id = ? ORDER BY timestamp"
+    )
+    
+    # Copies legacy wide rows into field_validations, skipping fields the document never had
+    MIGRATE_VALIDATION_RESULTS_SQL = '''
+        INSERT OR IGNORE INTO field_validations (document_id, field_name, value, valid, reason, extra)
+        SELECT document_id, 'Aadhaar Number', aadhaar_number, aadhaar_valid, aadhaar_reason,
+               json_object('type', aadhaar_type)
+        FROM validation_results WHERE aadhaar_number != '' OR aadhaar_reason != 'N/A'
+        UNION ALL
+        SELECT document_id, 'Name', name, name_valid, name_reason, json_object('length', name_length)
+        FROM validation_results WHERE name != '' OR name_reason != 'N/A'
+        UNION ALL
+        SELECT document_id, 'DOB', dob, dob_valid, dob_reason, json_object('parsed_date', dob_parsed_date)
+        FROM validation_results WHERE dob != '' OR dob_reason != 'N/A'
+        UNION ALL
+        SELECT document_id, 'Gender', gender, gender_valid, gender_reason, NULL
+        FROM validation_results WHERE gender != '' OR gender_reason != 'N/A'
+        UNION ALL
+        SELECT document_id, 'Address', address, address_valid, address_reason, json_object('length', address_length)
+        FROM validation_results WHERE address != '' OR address_reason != 'N/A'
+        UNION ALL
+        SELECT document_id, 'PAN Number', pan_number, pan_valid, pan_reason, NULL
+        FROM validation_results WHERE pan_number != '' OR pan_reason != 'N/A'
+    '''
+    
+    INSERT_LOG_SQL = (
+        "INSERT INTO processing_logs (document_id, agent_name, action, status, details, processing_time_ms) "
+        "VALUES (?, ?, ?, ?, ?, ?)"
+    )
+    
+    # (index, table, columns) backing get_database_summary and view_document_details;
+    # field_validations is already keyed by document_id
+    INDEXES = (
+        ("idx_docs_processed", "documents", "processed_at DESC"),
+        ("idx_docs_valid_type", "documents", "is_valid, document_type"),
+        ("idx_logs_docid_ts", "processing_logs", "document_id, timestamp"),
+    )
+    
+    def __init__(self, db_path: str = "ocr_documents.db", backend: str = "pymupdf"):
         self.db_path = db_path
-        self.pdf_extractor = PDFExtractorTool()
+        self.pdf_extractor = PDFExtractorTool(backend=backend)
+        self._local = threading.local()
+        self._connections = {}
+        self._connections_lock = threading.Lock()
         self._init_persistent_database()
     
+    @property
+    def conn(self) -> sqlite3.Connection:
+        """Persistent WAL-mode connection owned by the calling thread"""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, isolation_level=None, check_same_thread=False)
+            # page_size only takes effect on a new database, so it must precede the WAL switch
+            conn.execute("PRAGMA page_size=8192")
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA cache_size=-65536")
+            conn.execute("PRAGMA mmap_size=268435456")
+            conn.execute("PRAGMA busy_timeout=10000")
+            self._local.conn = conn
+            with self._connections_lock:
+                self._connections[threading.current_thread()] = conn
+        return conn
+    
+    @property
+    def _pending_logs(self) -> list:
+        """Audit log entries queued by the calling thread"""
+        pending = getattr(self._local, "pending_logs", None)
+        if pending is None:
+            pending = self._local.pending_logs = []
+        return pending
+    
+    def close(self):
+        """Close the persistent database connections of every thread"""
+        if not hasattr(self, "_connections"):
+            return
+        with self._connections_lock:
+            for conn in self._connections.values():
+                conn.close()
+            self._connections.clear()
+        self._local = threading.local()
+    
+    def __del__(self):
+        self.close()
+    
+    def _release_finished_thread_connections(self):
+        """Close connections whose owning thread has exited"""
+        with self._connections_lock:
+            for thread in [thread for thread in self._connections if not thread.is_alive()]:
+                self._connections.pop(thread).close()
+    
+    @contextmanager
+    def _transaction(self):
+        """Run a block inside one explicit write transaction on the calling thread's connection"""
+        cursor = self.conn.cursor()
+        # IMMEDIATE takes the write lock up front, so concurrent writers queue on
+        # busy_timeout instead of failing a deferred read-to-write upgrade
+        cursor.execute("BEGIN IMMEDIATE")
+        try:
+            yield cursor
+        except Exception:
+            cursor.execute("ROLLBACK")
+            raise
+        cursor.execute("COMMIT")
+    
     def _init_persistent_database(self):
         """Initialize persistent database - only creates tables if they don't exist"""
         print("🗄️ Initializing persistent database...")
         
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
+        # CREATE TABLE IF NOT EXISTS is a no-op for tables that already exist,
+        # so the DDL runs unconditionally instead of probing sqlite_master first
+        with self._transaction() as cursor:
             
-            # Check if tables already exist
-            cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='documents'")
-            documents_exists = cursor.fetchone() is not None
+            # Databases created before field_validations keep one wide validation_results row per document
+            cursor.execute("SELECT name FROM sqlite_master WHERE type = 'table' AND name IN ('validation_results', 'field_validations')")
+            migrate_wide_results = {row[0] for row in cursor.fetchall()} == {'validation_results'}
             
-            cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='validation_results'")
-            validation_exists = cursor.fetchone() is not None
+            # Main documents table - stores document metadata and overall results
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS documents (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    file_path TEXT NOT NULL,
+                    document_type TEXT NOT NULL,
+                    extraction_confidence REAL,
+                    validation_status TEXT NOT NULL,
+                    is_valid BOOLEAN NOT NULL,
+                    overall_score REAL,
+                    error_count INTEGER DEFAULT 0,
+                    warning_count INTEGER DEFAULT 0,
+                    extracted_data TEXT,
+                    validation_errors TEXT,
+                    validation_warnings TEXT,
+                    processed_at TEXT DEFAULT CURRENT_TIMESTAMP,
+                    UNIQUE(file_path, processed_at)
+                )
+            ''')
             
-            if documents_exists and validation_exists:
-                print("✅ Database tables already exist - using existing structure")
-                # Show existing record count
-                cursor.execute("SELECT COUNT(*) FROM documents")
-                doc_count = cursor.fetchone()[0]
-                cursor.execute("SELECT COUNT(*) FROM validation_results")
-                val_count = cursor.fetchone()[0]
-                print(f"📊 Existing records: {doc_count} documents, {val_count} validation results")
+            # Field validations table - one row per validated field of a document
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS field_validations (
+                    document_id INTEGER NOT NULL,
+                    field_name TEXT NOT NULL,
+                    value TEXT,
+                    valid INTEGER,
+                    reason TEXT,
+                    extra TEXT,
+                    PRIMARY KEY (document_id, field_name),
+                    FOREIGN KEY (document_id) REFERENCES documents (id)
+                ) WITHOUT ROWID
+            ''')
+            
+            if migrate_wide_results:
+                cursor.execute(self.MIGRATE_VALIDATION_RESULTS_SQL)
+            
+            # Processing logs table - for audit trail
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS processing_logs (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    document_id INTEGER,
+                    agent_name TEXT NOT NULL,
+                    action TEXT NOT NULL,
+                    status TEXT NOT NULL,
+                    details TEXT,
+                    processing_time_ms INTEGER,
+                    timestamp TEXT DEFAULT CURRENT_TIMESTAMP,
+                    FOREIGN KEY (document_id) REFERENCES documents (id)
+                )
+            ''')
+            
+            self._ensure_indexes(cursor)
+            
+            # Highest row ids are O(1) reads on rowid tables, unlike COUNT(*)
+            cursor.execute("SELECT max(id) FROM documents")
+            last_document_id = cursor.fetchone()[0]
+            
+            if last_document_id is None:
+                print("✅ Database tables ready")
             else:
-                print("🔧 Creating new database tables...")
-                
-                # Main documents table - stores document metadata and overall results
-                cursor.execute('''
-                    CREATE TABLE IF NOT EXISTS documents (
-                        id INTEGER PRIMARY KEY AUTOINCREMENT,
-                        file_path TEXT NOT NULL,
-                        document_type TEXT NOT NULL,
-                        extraction_confidence REAL,
-                        validation_status TEXT NOT NULL,
-                        is_valid BOOLEAN NOT NULL,
-                        overall_score REAL,
-                        error_count INTEGER DEFAULT 0,
-                        warning_count INTEGER DEFAULT 0,
-                        extracted_data TEXT,
-                        validation_errors TEXT,
-                        validation_warnings TEXT,
-                        processed_at TEXT DEFAULT CURRENT_TIMESTAMP,
-                        UNIQUE(file_path, processed_at)
-                    )
-                ''')
-                
-                # Validation results table - stores field-level validation details
-                cursor.execute('''
-                    CREATE TABLE IF NOT EXISTS validation_results (
-                        id INTEGER PRIMARY KEY AUTOINCREMENT,
-                        document_id INTEGER NOT NULL,
-                        
-                        -- Aadhaar Number validation
-                        aadhaar_number TEXT,
-                        aadhaar_valid BOOLEAN,
-                        aadhaar_reason TEXT,
-                        aadhaar_type TEXT,
-                        
-                        -- Name validation
-                        name TEXT,
-                        name_valid BOOLEAN,
-                        name_reason TEXT,
-                        name_length INTEGER,
-                        
-                        -- Date of Birth validation
-                        dob TEXT,
-                        dob_valid BOOLEAN,
-                        dob_reason TEXT,
-                        dob_parsed_date TEXT,
-                        
-                        -- Gender validation
-                        gender TEXT,
-                        gender_valid BOOLEAN,
-                        gender_reason TEXT,
-                        
-                        -- Address validation
-                        address TEXT,
-                        address_valid BOOLEAN,
-                        address_reason TEXT,
-                        address_length INTEGER,
-                        
-                        -- PAN Number validation (if present)
-                        pan_number TEXT,
-                        pan_valid BOOLEAN,
-                        pan_reason TEXT,
-                        
-                        validation_timestamp TEXT DEFAULT CURRENT_TIMESTAMP,
-                        FOREIGN KEY (document_id) REFERENCES documents (id)
-                    )
-                ''')
-                
-                # Processing logs table - for audit trail
-                cursor.execute('''
-                    CREATE TABLE IF NOT EXISTS processing_logs (
-                        id INTEGER PRIMARY KEY AUTOINCREMENT,
-                        document_id INTEGER,
-                        agent_name TEXT NOT NULL,
-                        action TEXT NOT NULL,
-                        status TEXT NOT NULL,
-                        details TEXT,
-                        processing_time_ms INTEGER,
-                        timestamp TEXT DEFAULT CURRENT_TIMESTAMP,
-                        FOREIGN KEY (document_id) REFERENCES documents (id)
-                    )
-                ''')
-                
-                conn.commit()
-                print("✅ Database tables created successfully")
+                print("✅ Database tables already exist - using existing structure")
+                print(f"📊 Existing records: up to document ID {last_document_id}")
+    
+    def _ensure_indexes(self, cursor):
+        """Create the summary/detail lookup indexes missing from this database and refresh planner stats"""
+        cursor.execute("SELECT name FROM sqlite_master WHERE type = 'index'")
+        existing = {row[0] for row in cursor.fetchall()}
+        
+        created = False
+        for index_name, table_name, columns in self.INDEXES:
+            if index_name not in existing:
+                cursor.execute(f"CREATE INDEX IF NOT EXISTS {index_name} ON {table_name}({columns})")
+                created = True
+        
+        if created:
+            cursor.execute("ANALYZE")
+    
+    @staticmethod
+    def _emit(*lines):
+        """Write a block of detail lines to stdout in one call"""
+        sys.stdout.write("\n".join(lines) + "\n")
     
     def process_document(self, file_path: str, show_details: bool = True) -> dict:
         """
         Complete pipeline: Extract → Validate → Store
         Returns processing result summary
         """
-        start_time = datetime.now()
+        start_time = time.perf_counter_ns()
         processing_result = {
             "file_path": file_path,
             "status": "success",
@@ -156,18 +345,19 @@ class CompletePipelineProcessor:
         
         try:
             if show_details:
-                print(f"\n{'='*100}")
-                print(f"🔄 COMPLETE PIPELINE PROCESSING: {file_path}")
-                print(f"{'='*100}")
+                self._emit(
+                    f"\n{'='*100}",
+                    f"🔄 COMPLETE PIPELINE PROCESSING: {file_path}",
+                    f"{'='*100}"
+                )
             
             # Step 1: Extract fields using PDF Extractor Agent
             if show_details:
-                print(f"\n1. 📄 EXTRACTOR AGENT - Extracting fields from document")
-                print("-" * 80)
+                self._emit(f"\n1. 📄 EXTRACTOR AGENT - Extracting fields from document", "-" * 80)
             
-            extraction_start = datetime.now()
+            extraction_start = time.perf_counter_ns()
             extraction_result = self.pdf_extractor.extract_document_data(file_path)
-            extraction_time = (datetime.now() - extraction_start).total_seconds() * 1000
+            extraction_time = (time.perf_counter_ns() - extraction_start) / 1e6
             
             processing_result["extraction_result"] = extraction_result
             
@@ -177,228 +367,281 @@ class CompletePipelineProcessor:
                 return processing_result
             
             if show_details:
-                print(f"✅ Extraction completed in {extraction_time:.1f}ms")
-                print(f"📊 Confidence: {extraction_result.get('extraction_confidence', 0):.2f}")
-                print(f"🏷️ Document Type: {extraction_result.get('document_type', 'Unknown')}")
-                print("📋 Extracted Fields:")
-                for field, value in extraction_result.get("extracted_data", {}).items():
-                    print(f"  • {field}: {value}")
+                self._emit(
+                    f"✅ Extraction completed in {extraction_time:.1f}ms",
+                    f"📊 Confidence: {extraction_result.get('extraction_confidence', 0):.2f}",
+                    f"🏷️ Document Type: {extraction_result.get('document_type', 'Unknown')}",
+                    "📋 Extracted Fields:",
+                    *(f"  • {field}: {value}" for field, value in extraction_result.get("extracted_data", {}).items())
+                )
             
             # Step 2: Validate extracted fields using Validator Agent
             if show_details:
-                print(f"\n2. 🔍 VALIDATOR AGENT - Validating extracted fields")
-                print("-" * 80)
+                self._emit(f"\n2. 🔍 VALIDATOR AGENT - Validating extracted fields", "-" * 80)
             
-            validation_start = datetime.now()
+            validation_start = time.perf_counter_ns()
             validation_result = self._validate_extracted_fields(extraction_result)
-            validation_time = (datetime.now() - validation_start).total_seconds() * 1000
+            validation_time = (time.perf_counter_ns() - validation_start) / 1e6
             
             processing_result["validation_result"] = validation_result
             
             if show_details:
-                print(f"✅ Validation completed in {validation_time:.1f}ms")
-                print(f"📊 Overall Score: {validation_result['overall_score']:.2f}")
-                print(f"🎯 Status: {validation_result['validation_status'].upper()}")
-                print(f"⚠️ Errors: {len(validation_result['errors'])}")
-                print("🔍 Field Validation Results:")
-                for field_name, field_data in validation_result["validation_details"].items():
-                    status = "✅ VALID" if field_data.get('valid', False) else "❌ INVALID"
-                    reason = field_data.get('reason', 'N/A')
-                    print(f"  • {field_name}: {status} ({reason})")
+                self._emit(
+                    f"✅ Validation completed in {validation_time:.1f}ms",
+                    f"📊 Overall Score: {validation_result['overall_score']:.2f}",
+                    f"🎯 Status: {validation_result['validation_status'].upper()}",
+                    f"⚠️ Errors: {validation_result['error_count']}",
+                    "🔍 Field Validation Results:",
+                    *(
+                        f"  • {field_name}: {'✅ VALID' if field_data.get('valid', False) else '❌ INVALID'} "
+                        f"({field_data.get('reason', 'N/A')})"
+                        for field_name, field_data in validation_result["validation_details"].items()
+                    )
+                )
             
             # Step 3: Store results in database using Database Agent
             if show_details:
-                print(f"\n3. 🗄️ DATABASE AGENT - Storing validation results")
-                print("-" * 80)
+                self._emit(f"\n3. 🗄️ DATABASE AGENT - Storing validation results", "-" * 80)
             
-            database_start = datetime.now()
+            database_start = time.perf_counter_ns()
             database_result = self._store_results_in_database(
-                file_path, extraction_result, validation_result
+                file_path, extraction_result, validation_result, extraction_time, validation_time
             )
-            database_time = (datetime.now() - database_start).total_seconds() * 1000
+            database_time = (time.perf_counter_ns() - database_start) / 1e6
             
             processing_result["database_result"] = database_result
             processing_result["document_id"] = database_result.get("document_id")
             
             if show_details:
-                print(f"✅ Database storage completed in {database_time:.1f}ms")
-                print(f"🆔 Document ID: {database_result.get('document_id')}")
-                print(f"💾 Tables updated: documents, validation_results, processing_logs")
-            
-            # Log processing activities
-            self._log_processing_activity(
-                database_result.get("document_id"),
-                "ExtractorAgent", "extract_fields", "success", 
-                {"confidence": extraction_result.get("extraction_confidence"), "time_ms": extraction_time}
-            )
-            self._log_processing_activity(
-                database_result.get("document_id"),
-                "ValidatorAgent", "validate_fields", "success",
-                {"score": validation_result["overall_score"], "time_ms": validation_time}
-            )
-            self._log_processing_activity(
-                database_result.get("document_id"),
-                "DatabaseAgent", "store_results", "success",
-                {"time_ms": database_time}
-            )
+                self._emit(
+                    f"✅ Database storage completed in {database_time:.1f}ms",
+                    f"🆔 Document ID: {database_result.get('document_id')}",
+                    f"💾 Tables updated: documents, field_validations, processing_logs"
+                )
             
             # Calculate total processing time
-            total_time = (datetime.now() - start_time).total_seconds() * 1000
+            total_time = (time.perf_counter_ns() - start_time) / 1e6
             processing_result["processing_time_ms"] = total_time
             
             if show_details:
-                print(f"\n4. ✅ PIPELINE COMPLETED")
-                print("-" * 80)
-                print(f"⏱️ Total Processing Time: {total_time:.1f}ms")
-                print(f"🆔 Document stored with ID: {database_result.get('document_id')}")
-                print(f"📊 Overall Result: {validation_result['validation_status'].upper()}")
+                self._emit(
+                    f"\n4. ✅ PIPELINE COMPLETED",
+                    "-" * 80,
+                    f"⏱️ Total Processing Time: {total_time:.1f}ms",
+                    f"🆔 Document stored with ID: {database_result.get('document_id')}",
+                    f"📊 Overall Result: {validation_result['validation_status'].upper()}"
+                )
             
             return processing_result
             
         except Exception as e:
             processing_result["status"] = "error"
             processing_result["errors"].append(str(e))
-            processing_result["processing_time_ms"] = (datetime.now() - start_time).total_seconds() * 1000
+            processing_result["processing_time_ms"] = (time.perf_counter_ns() - start_time) / 1e6
             
             if show_details:
                 print(f"❌ Pipeline failed: {e}")
             
             return processing_result
     
+    def process_documents(self, file_paths: list, workers: int = None) -> list:
+        """
+        Run process_document over several files concurrently, one thread and
+        database connection per worker; results keep the input order
+        """
+        with ThreadPoolExecutor(max_workers=workers or os.cpu_count()) as executor:
+            results = list(executor.map(lambda path: self.process_document(path, show_details=False), file_paths))
+        
+        self._release_finished_thread_connections()
+        return results
+    
+    def process_documents_batch(self, file_paths: list) -> list:
+        """
+        Extract and validate several documents, then store them and their
+        processing logs in a single database transaction, with a savepoint per
+        document so one failing row only fails that document
+        """
+        results = []
+        pending = []
+        
+        for file_path in file_paths:
+            start_time = time.perf_counter_ns()
+            processing_result = {
+                "file_path": file_path,
+                "status": "success",
+                "document_id": None,
+                "extraction_result": None,
+                "validation_result": None,
+                "database_result": None,
+                "processing_time_ms": 0,
+                "errors": [],
+                "warnings": []
+            }
+            results.append(processing_result)
+            
+            try:
+                extraction_start = time.perf_counter_ns()
+                extraction_result = self.pdf_extractor.extract_document_data(file_path)
+                extraction_time = (time.perf_counter_ns() - extraction_start) / 1e6
+                processing_result["extraction_result"] = extraction_result
+                
+                if extraction_result["status"] != "success":
+                    processing_result["status"] = "extraction_failed"
+                    processing_result["errors"].append(f"Extraction failed: {extraction_result.get('error', 'Unknown error')}")
+                    continue
+                
+                validation_start = time.perf_counter_ns()
+                validation_result = self._validate_extracted_fields(extraction_result)
+                validation_time = (time.perf_counter_ns() - validation_start) / 1e6
+                processing_result["validation_result"] = validation_result
+                
+                pending.append((processing_result, start_time, extraction_time, validation_time))
+            
+            except Exception as e:
+                processing_result["status"] = "error"
+                processing_result["errors"].append(str(e))
+                processing_result["processing_time_ms"] = (time.perf_counter_ns() - start_time) / 1e6
+        
+        if not pending:
+            return results
+        
+        # Store every validated document and its logs with one commit; each document
+        # gets its own savepoint so one failing row does not roll back the others
+        failed_activities = []
+        try:
+            with self._transaction() as cursor:
+                activities = []
+                
+                for processing_result, start_time, extraction_time, validation_time in pending:
+                    database_start = time.perf_counter_ns()
+                    cursor.execute("SAVEPOINT store_document")
+                    try:
+                        document_id = self._insert_results(
+                            cursor, processing_result["file_path"], processing_result["validation_result"]
+                        )
+                    except Exception as e:
+                        cursor.execute("ROLLBACK TO store_document")
+                        cursor.execute("RELEASE store_document")
+                        self._mark_storage_failed(processing_result, e)
+                        activities.extend(self._pipeline_activities(
+                            None, processing_result["extraction_result"], processing_result["validation_result"],
+                            extraction_time, validation_time, (time.perf_counter_ns() - database_start) / 1e6
+                        ))
+                        continue
+                    cursor.execute("RELEASE store_document")
+                    database_time = (time.perf_counter_ns() - database_start) / 1e6
+                    
+                    processing_result["database_result"] = {
+                        "status": "success",
+                        "document_id": document_id,
+                        "message": "Results stored successfully in persistent database"
+                    }
+                    processing_result["document_id"] = document_id
+                    activities.extend(self._pipeline_activities(
+                        document_id, processing_result["extraction_result"], processing_result["validation_result"],
+                        extraction_time, validation_time, database_time
+                    ))
+                
+                self._insert_logs(cursor, activities)
+        
+        except Exception as e:
+            for processing_result, _, extraction_time, validation_time in pending:
+                if processing_result["status"] == "success":
+                    self._mark_storage_failed(processing_result, e)
+                failed_activities.extend(self._pipeline_activities(
+                    None, processing_result["extraction_result"], processing_result["validation_result"],
+                    extraction_time, validation_time, 0.0
+                ))
+        
+        if failed_activities:
+            self._log_processing_activities(failed_activities)
+        
+        for processing_result, start_time, _, _ in pending:
+            processing_result["processing_time_ms"] = (time.perf_counter_ns() - start_time) / 1e6
+        
+        return results
+    
+    def _mark_storage_failed(self, processing_result: dict, error: Exception):
+        """Record on a batch result that its database write failed"""
+        processing_result["status"] = "storage_failed"
+        processing_result["document_id"] = None
+        processing_result["errors"].append(f"Database storage failed: {error}")
+        processing_result["database_result"] = {
+            "status": "error",
+            "error": str(error),
+            "message": "Failed to store results in database"
+        }
+    
+    def _pipeline_activities(self, document_id: int, extraction_result: dict, validation_result: dict,
+                             extraction_time: float, validation_time: float, database_time: float) -> list:
+        """Build the processing_logs rows for one document's pass through the pipeline"""
+        # The details payloads have a fixed shape of plain numbers, so they are formatted
+        # straight to JSON instead of going through a dict and a serializer
+        confidence = extraction_result.get("extraction_confidence")
+        confidence_json = "null" if confidence is None else repr(float(confidence))
+        return [
+            (document_id, "ExtractorAgent", "extract_fields", "success",
+             f'{{"confidence":{confidence_json},"time_ms":{extraction_time!r}}}', extraction_time),
+            (document_id, "ValidatorAgent", "validate_fields", "success",
+             f'{{"score":{float(validation_result["overall_score"])!r},"time_ms":{validation_time!r}}}', validation_time),
+            (document_id, "DatabaseAgent", "store_results", "success",
+             f'{{"time_ms":{database_time!r}}}', database_time)
+        ]
+    
     def _validate_extracted_fields(self, extraction_result: dict) -> dict:
         """Validate all extracted fields using FieldValidator"""
         
         extracted_data = extraction_result.get("extracted_data", {})
         validation_details = {}
+        errors = []
+        valid_fields = 0
         
-        # Validate each field that was extracted
+        # Validate each field that was extracted, scoring it and collecting its error in the same pass
         for field_name, field_value in extracted_data.items():
-            if field_name == "Aadhaar Number":
-                validation_details[field_name] = FieldValidator.validate_aadhaar_number(field_value)
-            elif field_name == "Name":
-                validation_details[field_name] = FieldValidator.validate_name(field_value)
-            elif field_name == "DOB" or field_name == "Date of Birth":
-                validation_details[field_name] = FieldValidator.validate_date(field_value)
-            elif field_name == "Gender":
-                validation_details[field_name] = FieldValidator.validate_gender(field_value)
-            elif field_name == "Address":
-                validation_details[field_name] = FieldValidator.validate_address(field_value)
-            elif field_name == "PAN Number" or field_name == "PAN":
-                validation_details[field_name] = FieldValidator.validate_pan_number(field_value)
+            validator = FIELD_VALIDATORS.get(field_name, _validate_generic_field)
+            field_result = validation_details[field_name] = validator(field_value)
+            if field_result.get('valid', False):
+                valid_fields += 1
             else:
-                # Generic validation for unknown fields
-                validation_details[field_name] = {
-                    "valid": bool(field_value and str(field_value).strip()),
-                    "type": "generic",
-                    "reason": "present" if field_value else "missing"
-                }
+                errors.append(f"{field_name}: {field_result.get('reason', 'invalid')}")
         
         # Calculate overall validation score
-        valid_fields = sum(1 for result in validation_details.values() if result.get('valid', False))
         total_fields = len(validation_details)
         overall_score = valid_fields / total_fields if total_fields > 0 else 0.0
         
-        # Collect errors and warnings
-        errors = []
-        warnings = []
-        
-        for field_name, field_result in validation_details.items():
-            if not field_result.get('valid', False):
-                errors.append(f"{field_name}: {field_result.get('reason', 'invalid')}")
-        
         # Add warnings from extraction
-        warnings.extend(extraction_result.get("warnings", []))
+        warnings = list(extraction_result.get("warnings", []))
+        error_count = len(errors)
         
         return {
-            "validation_status": "passed" if len(errors) == 0 else "failed",
+            "validation_status": "passed" if error_count == 0 else "failed",
             "document_type": extraction_result.get("document_type", "UNKNOWN"),
             "validation_details": validation_details,
             "errors": errors,
             "warnings": warnings,
+            "error_count": error_count,
+            "warning_count": len(warnings),
             "overall_score": overall_score,
             "extracted_data": extracted_data,
-            "is_valid": len(errors) == 0,
+            "is_valid": error_count == 0,
             "extraction_confidence": extraction_result.get("extraction_confidence", 0.0)
         }
     
-    def _store_results_in_database(self, file_path: str, extraction_result: dict, validation_result: dict) -> dict:
+    def _store_results_in_database(self, file_path: str, extraction_result: dict, validation_result: dict,
+                                   extraction_time: float = 0.0, validation_time: float = 0.0) -> dict:
         """Store extraction and validation results in persistent database"""
+        database_start = time.perf_counter_ns()
         
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
-                
-                # Insert into documents table
-                cursor.execute('''
-                    INSERT INTO documents (
-                        file_path, document_type, extraction_confidence,
-                        validation_status, is_valid, overall_score,
-                        error_count, warning_count, extracted_data,
-                        validation_errors, validation_warnings
-                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                ''', (
-                    file_path,
-                    validation_result["document_type"],
-                    validation_result["extraction_confidence"],
-                    validation_result["validation_status"],
-                    validation_result["is_valid"],
-                    validation_result["overall_score"],
-                    len(validation_result["errors"]),
-                    len(validation_result["warnings"]),
-                    json.dumps(validation_result["extracted_data"]),
-                    json.dumps(validation_result["errors"]),
-                    json.dumps(validation_result["warnings"])
-                ))
+            with self._transaction() as cursor:
+                document_id = self._insert_results(cursor, file_path, validation_result)
                 
-                document_id = cursor.lastrowid
-                
-                # Insert into validation_results table
-                validation_details = validation_result["validation_details"]
-                extracted_data = validation_result["extracted_data"]
-                
-                cursor.execute('''
-                    INSERT INTO validation_results (
-                        document_id,
-                        aadhaar_number, aadhaar_valid, aadhaar_reason, aadhaar_type,
-                        name, name_valid, name_reason, name_length,
-                        dob, dob_valid, dob_reason, dob_parsed_date,
-                        gender, gender_valid, gender_reason,
-                        address, address_valid, address_reason, address_length,
-                        pan_number, pan_valid, pan_reason
-                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                ''', (
-                    document_id,
-                    # Aadhaar
-                    extracted_data.get("Aadhaar Number", ""),
-                    validation_details.get("Aadhaar Number", {}).get("valid", False),
-                    validation_details.get("Aadhaar Number", {}).get("reason", "N/A"),
-                    validation_details.get("Aadhaar Number", {}).get("type", "unknown"),
-                    # Name
-                    extracted_data.get("Name", ""),
-                    validation_details.get("Name", {}).get("valid", False),
-                    validation_details.get("Name", {}).get("reason", "N/A"),
-                    validation_details.get("Name", {}).get("length", 0),
-                    # DOB
-                    extracted_data.get("DOB", extracted_data.get("Date of Birth", "")),
-                    validation_details.get("DOB", validation_details.get("Date of Birth", {})).get("valid", False),
-                    validation_details.get("DOB", validation_details.get("Date of Birth", {})).get("reason", "N/A"),
-                    validation_details.get("DOB", validation_details.get("Date of Birth", {})).get("parsed_date", ""),
-                    # Gender
-                    extracted_data.get("Gender", ""),
-                    validation_details.get("Gender", {}).get("valid", False),
-                    validation_details.get("Gender", {}).get("reason", "N/A"),
-                    # Address
-                    extracted_data.get("Address", ""),
-                    validation_details.get("Address", {}).get("valid", False),
-                    validation_details.get("Address", {}).get("reason", "N/A"),
-                    validation_details.get("Address", {}).get("length", 0),
-                    # PAN
-                    extracted_data.get("PAN Number", extracted_data.get("PAN", "")),
-                    validation_details.get("PAN Number", validation_details.get("PAN", {})).get("valid", False),
-                    validation_details.get("PAN Number", validation_details.get("PAN", {})).get("reason", "N/A")
+                # Log processing activities in the same transaction as the document rows
+                self._pending_logs.extend(self._pipeline_activities(
+                    document_id, extraction_result, validation_result,
+                    extraction_time, validation_time, (time.perf_counter_ns() - database_start) / 1e6
                 ))
-                
-                conn.commit()
+                self._flush_pending_logs(cursor)
                 
                 return {
                     "status": "success",
@@ -407,135 +650,160 @@ class CompletePipelineProcessor:
                 }
                 
         except Exception as e:
+            self._pending_logs.clear()
+            self._log_processing_activities(self._pipeline_activities(
+                None, extraction_result, validation_result,
+                extraction_time, validation_time, (time.perf_counter_ns() - database_start) / 1e6
+            ))
             return {
                 "status": "error",
                 "error": str(e),
                 "message": "Failed to store results in database"
             }
     
+    def _insert_results(self, cursor, file_path: str, validation_result: dict) -> int:
+        """Insert one document and its field validation row, returning the document id"""
+        # Insert into documents table
+        cursor.execute(self.INSERT_DOCUMENT_SQL, (
+            file_path,
+            validation_result["document_type"],
+            validation_result["extraction_confidence"],
+            validation_result["validation_status"],
+            validation_result["is_valid"],
+            validation_result["overall_score"],
+            validation_result["error_count"],
+            validation_result["warning_count"],
+            orjson.dumps(validation_result["extracted_data"]).decode(),
+            orjson.dumps(validation_result["errors"]).decode(),
+            orjson.dumps(validation_result["warnings"]).decode()
+        ))
+        
+        document_id = cursor.fetchone()[0] if self.RETURNING_SUPPORTED else cursor.lastrowid
+        
+        # Insert one field_validations row per validated field, under its canonical name
+        extracted_data = _canonical_fields(validation_result["extracted_data"])
+        cursor.executemany(self.INSERT_FIELD_VALIDATION_SQL, [
+            (
+                document_id,
+                field_name,
+                extracted_data.get(field_name, ""),
+                field_result.get("valid", False),
+                field_result.get("reason", "N/A"),
+                _field_extra(field_result)
+            )
+            for field_name, field_result in _canonical_fields(validation_result["validation_details"]).items()
+            if field_name not in FIELD_ALIASES
+        ])
+        
+        return document_id
+    
+    def _insert_logs(self, cursor, activities: list):
+        """Insert (document_id, agent_name, action, status, details_json, time_ms) log rows"""
+        cursor.executemany(self.INSERT_LOG_SQL, activities)
+    
     def _log_processing_activity(self, document_id: int, agent_name: str, action: str, status: str, details: dict):
-        """Log processing activity for audit trail"""
+        """Queue processing activity for the audit trail; written by the next _flush_pending_logs"""
+        self._pending_logs.append(
+            (document_id, agent_name, action, status, orjson.dumps(details).decode(), details.get('time_ms', 0))
+        )
+    
+    def _flush_pending_logs(self, cursor):
+        """Write queued audit log entries inside the caller's transaction"""
+        if self._pending_logs:
+            self._insert_logs(cursor, self._pending_logs)
+            self._pending_logs.clear()
+    
+    def _log_processing_activities(self, activities: list):
+        """Log several processing activities for audit trail in one transaction"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
-                cursor.execute('''
-                    INSERT INTO processing_logs (
-                        document_id, agent_name, action, status, details, processing_time_ms
-                    ) VALUES (?, ?, ?, ?, ?, ?)
-                ''', (
-                    document_id, agent_name, action, status,
-                    json.dumps(details), details.get('time_ms', 0)
-                ))
-                conn.commit()
+            with self._transaction() as cursor:
+                self._insert_logs(cursor, activities)
         except Exception as e:
             print(f"Warning: Failed to log processing activity: {e}")
     
     def get_database_summary(self) -> dict:
         """Get summary of all documents in the database"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
-                
-                # Total documents
-                cursor.execute("SELECT COUNT(*) FROM documents")
-                total_docs = cursor.fetchone()[0]
-                
-                # Valid vs invalid
-                cursor.execute("SELECT COUNT(*) FROM documents WHERE is_valid = 1")
-                valid_docs = cursor.fetchone()[0]
-                invalid_docs = total_docs - valid_docs
-                
-                # Average scores
-                cursor.execute("SELECT AVG(overall_score), AVG(extraction_confidence) FROM documents")
-                avg_scores = cursor.fetchone()
-                
-                # Document types
-                cursor.execute("SELECT document_type, COUNT(*) FROM documents GROUP BY document_type")
-                doc_types = dict(cursor.fetchall())
-                
-                # Recent documents
-                cursor.execute('''
-                    SELECT id, file_path, validation_status, overall_score, processed_at 
-                    FROM documents 
-                    ORDER BY processed_at DESC 
-                    LIMIT 5
-                ''')
-                recent_docs = cursor.fetchall()
-                
-                return {
-                    "total_documents": total_docs,
-                    "valid_documents": valid_docs,
-                    "invalid_documents": invalid_docs,
-                    "average_validation_score": round(avg_scores[0] or 0, 3),
-                    "average_extraction_confidence": round(avg_scores[1] or 0, 3),
-                    "document_types": doc_types,
-                    "recent_documents": [
-                        {
-                            "id": doc[0], "file": doc[1], "status": doc[2], 
-                            "score": doc[3], "processed": doc[4]
-                        } for doc in recent_docs
-                    ]
-                }
+            cursor = self.conn.cursor()
+            
+            # Totals, valid count and average scores in one pass over documents
+            cursor.execute(self.SUMMARY_TOTALS_SQL)
+            total_docs, valid_docs, *avg_scores = cursor.fetchone()
+            invalid_docs = total_docs - valid_docs
+            
+            # Document types
+            cursor.execute(self.SUMMARY_TYPES_SQL)
+            doc_types = dict(cursor.fetchall())
+            
+            # Recent documents
+            cursor.execute(self.RECENT_DOCUMENTS_SQL)
+            recent_docs = cursor.fetchall()
+            
+            return {
+                "total_documents": total_docs,
+                "valid_documents": valid_docs,
+                "invalid_documents": invalid_docs,
+                "average_validation_score": round(avg_scores[0] or 0, 3),
+                "average_extraction_confidence": round(avg_scores[1] or 0, 3),
+                "document_types": doc_types,
+                "recent_documents": [
+                    {
+                        "id": doc[0], "file": doc[1], "status": doc[2], 
+                        "score": doc[3], "processed": doc[4]
+                    } for doc in recent_docs
+                ]
+            }
         except Exception as e:
             return {"error": str(e)}
     
     def view_document_details(self, document_id: int) -> dict:
         """Get detailed information about a specific document"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
-                
-                # Get document info
-                cursor.execute("SELECT * FROM documents WHERE id = ?", (document_id,))
-                doc_row = cursor.fetchone()
-                
-                if not doc_row:
-                    return {"error": "Document not found"}
-                
-                # Get validation details
-                cursor.execute("SELECT * FROM validation_results WHERE document_id = ?", (document_id,))
-                val_row = cursor.fetchone()
-                
-                # Get processing logs
-                cursor.execute('''
-                    SELECT agent_name, action, status, processing_time_ms, timestamp 
-                    FROM processing_logs 
-                    WHERE document_id = ? 
-                    ORDER BY timestamp
-                ''', (document_id,))
-                logs = cursor.fetchall()
-                
-                return {
-                    "document": {
-                        "id": doc_row[0],
-                        "file_path": doc_row[1],
-                        "document_type": doc_row[2],
-                        "extraction_confidence": doc_row[3],
-                        "validation_status": doc_row[4],
-                        "is_valid": bool(doc_row[5]),
-                        "overall_score": doc_row[6],
-                        "error_count": doc_row[7],
-                        "warning_count": doc_row[8],
-                        "extracted_data": json.loads(doc_row[9]) if doc_row[9] else {},
-                        "validation_errors": json.loads(doc_row[10]) if doc_row[10] else [],
-                        "validation_warnings": json.loads(doc_row[11]) if doc_row[11] else [],
-                        "processed_at": doc_row[12]
-                    },
-                    "validation_details": {
-                        "aadhaar": {"value": val_row[2], "valid": val_row[3], "reason": val_row[4]} if val_row else {},
-                        "name": {"value": val_row[6], "valid": val_row[7], "reason": val_row[8]} if val_row else {},
-                        "dob": {"value": val_row[10], "valid": val_row[11], "reason": val_row[12]} if val_row else {},
-                        "gender": {"value": val_row[14], "valid": val_row[15], "reason": val_row[16]} if val_row else {},
-                        "address": {"value": val_row[17], "valid": val_row[18], "reason": val_row[19]} if val_row else {},
-                        "pan": {"value": val_row[21], "valid": val_row[22], "reason": val_row[23]} if val_row else {}
-                    },
-                    "processing_logs": [
-                        {
-                            "agent": log[0], "action": log[1], "status": log[2],
-                            "time_ms": log[3], "timestamp": log[4]
-                        } for log in logs
-                    ]
+            cursor = self.conn.cursor()
+            
+            # Get document info
+            cursor.execute(self.SELECT_DOCUMENT_SQL, (document_id,))
+            doc_row = cursor.fetchone()
+            
+            if not doc_row:
+                return {"error": "Document not found"}
+            
+            # Get validation details
+            validation_details = {key: {"value": "", "valid": 0, "reason": "N/A"} for key in DETAIL_KEYS.values()}
+            cursor.execute(self.SELECT_FIELD_VALIDATIONS_SQL, (document_id,))
+            for field_name, value, valid, reason in cursor.fetchall():
+                validation_details[DETAIL_KEYS.get(field_name, field_name)] = {
+                    "value": value, "valid": valid, "reason": reason
                 }
+            
+            # Get processing logs
+            cursor.execute(self.SELECT_LOGS_SQL, (document_id,))
+            logs = cursor.fetchall()
+            
+            return {
+                "document": {
+                    "id": doc_row[0],
+                    "file_path": doc_row[1],
+                    "document_type": doc_row[2],
+                    "extraction_confidence": doc_row[3],
+                    "validation_status": doc_row[4],
+                    "is_valid": bool(doc_row[5]),
+                    "overall_score": doc_row[6],
+                    "error_count": doc_row[7],
+                    "warning_count": doc_row[8],
+                    "extracted_data": orjson.loads(doc_row[9]) if doc_row[9] else {},
+                    "validation_errors": orjson.loads(doc_row[10]) if doc_row[10] else [],
+                    "validation_warnings": orjson.loads(doc_row[11]) if doc_row[11] else [],
+                    "processed_at": doc_row[12]
+                },
+                "validation_details": validation_details,
+                "processing_logs": [
+                    {
+                        "agent": log[0], "action": log[1], "status": log[2],
+                        "time_ms": log[3], "timestamp": log[4]
+                    } for log in logs
+                ]
+            }
         except Exception as e:
             return {"error": str(e)}
 
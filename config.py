@@ -32,4 +32,10 @@ class Config:
     
     # OpenAI settings
     OPENAI_API_KEY = os.getenv('OPENAI_API_KEY')
-    OPENAI_MODEL = os.getenv('OPENAI_MODEL', 'gpt-4')
\ No newline at end of file
+    OPENAI_MODEL = os.getenv('OPENAI_MODEL', 'gpt-4')
+    
+    # Skip the LLM when pattern extraction alone reaches this overall confidence
+    LLM_SKIP_THRESHOLD = float(os.getenv('LLM_SKIP_THRESHOLD', '0.85'))
+    
+    # Maximum concurrent LLM requests when extracting documents in batch
+    LLM_MAX_CONCURRENCY = int(os.getenv('LLM_MAX_CONCURRENCY', '8'))
@@ -148,25 +148,21 @@ def process_document_with_graph(file_path: str) -> dict:
             "processing_log": [f"Error: {str(e)}"]
         }
 
-def process_batch_with_graph(file_paths: list) -> list:
-    """Process multiple documents using the LangGraph workflow"""
+def iter_batch_with_graph(file_paths: list):
+    """Process multiple documents using the LangGraph workflow, yielding each result"""
     
     logger.info(f"Starting batch processing with LangGraph for {len(file_paths)} files")
     
-    results = []
+    processed = 0
+    success_count = 0
     
     for file_path in file_paths:
         try:
             result = process_document_with_graph(file_path)
-            results.append(result)
-            
-            # Log progress
-            success_count = len([r for r in results if r.get('validation_status') == 'passed'])
-            logger.info(f"Processed {len(results)}/{len(file_paths)} files. Success: {success_count}")
             
         except Exception as e:
             logger.error(f"Error processing {file_path}: {e}")
-            error_result = {
+            result = {
                 "processing_timestamp": None,
                 "file_path": file_path,
                 "document_type": "UNKNOWN",
@@ -179,7 +175,17 @@ def process_batch_with_graph(file_paths: list) -> list:
                 "validation_details": {},
                 "processing_log": [f"Error: {str(e)}"]
             }
-            results.append(error_result)
+        
+        # Log progress
+        processed += 1
+        if result.get('validation_status') == 'passed':
+            success_count += 1
+        logger.info(f"Processed {processed}/{len(file_paths)} files. Success: {success_count}")
+        
+        yield result
     
-    logger.info(f"Batch processing completed. Processed {len(results)} files")
-    return results 
\ No newline at end of file
+    logger.info(f"Batch processing completed. Processed {processed} files")
+
+def process_batch_with_graph(file_paths: list) -> list:
+    """Process multiple documents using the LangGraph workflow"""
+    return list(iter_batch_with_graph(file_paths))
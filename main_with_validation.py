@@ -174,13 +174,17 @@ class ResultFormatter:
             print("\nNo results to display.")
             return
         
+        # Count processing and validation outcomes in a single pass
         total = len(results)
-        successful = sum(1 for r in results if r["status"] == "success")
+        successful = 0
+        valid_count = 0
+        for r in results:
+            if r["status"] == "success":
+                successful += 1
+            if r.get("validation", {}).get("is_valid", False):
+                valid_count += 1
         failed = total - successful
         
-        valid_count = sum(1 for r in results 
-                         if r.get("validation", {}).get("is_valid", False))
-        
         print(f"\n{'='*60}")
         print(f"BATCH PROCESSING SUMMARY")
         print(f"{'='*60}")
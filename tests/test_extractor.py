@@ -4,6 +4,7 @@ import tempfile
 from unittest.mock import patch, MagicMock
 from tools.pdf_extractor_tool import PDFExtractorTool
 from agents.extractor_agent import ExtractorAgent
+from agents.pan_extractor_agent import PANExtractorAgent
 
 class TestPDFExtractorTool(unittest.TestCase):
     def setUp(self):
@@ -80,3 +81,19 @@ class TestExtractorAgent(unittest.TestCase):
         }
         confidence = self.agent._calculate_confidence(pan_data)
         self.assertGreater(confidence, 0.5)
+
+class TestPANExtractorAgent(unittest.TestCase):
+    def setUp(self):
+        with patch('agents.pan_extractor_agent.get_llm'):
+            self.agent = PANExtractorAgent()
+    
+    def test_pattern_priority_with_overlapping_matches(self):
+        """Test a lower-priority match does not hide a higher-priority one"""
+        fields = self.agent._extract_with_patterns("PAN ABCDE1234F and XYZAB9876C")
+        self.assertEqual(fields['PAN Number'], 'ABCDE1234F')
+    
+    def test_initials_only_names(self):
+        """Test names that start with single-letter initials are extracted"""
+        fields = self.agent._extract_with_patterns("Name: R K SHARMA / Father's Name: S N SHARMA")
+        self.assertEqual(fields['Name'], 'R K SHARMA')
+        self.assertEqual(fields['Father\'s Name'], 'S N SHARMA')
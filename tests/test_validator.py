@@ -1,5 +1,6 @@
 import unittest
-from agents.validator_agent import ValidatorAgent
+from unittest import mock
+from agents.validator_agent import ValidatorAgent, FieldValidator
 
 class TestValidatorAgent(unittest.TestCase):
     def setUp(self):
@@ -56,6 +57,83 @@ class TestValidatorAgent(unittest.TestCase):
             result = self.validator._validate_date(date)
             self.assertFalse(result['valid'], f"Date {date} should be invalid")
     
+    def test_validate_date_formats(self):
+        """Test that each supported date shape parses to the same date"""
+        for date in ['15/08/1990', '15-08-1990', '1990-08-15', '15/08/90']:
+            result = FieldValidator.validate_date(date)
+            self.assertTrue(result['valid'], f"Date {date} should be valid")
+            self.assertEqual(result['parsed_date'], '1990-08-15')
+        
+        # Mixed separators are not a recognized shape
+        result = FieldValidator.validate_date('15/08-1990')
+        self.assertEqual(result['reason'], 'unrecognized_format')
+    
+    def test_validate_date_follows_current_year(self):
+        """Test that a repeated date is re-checked against the current year"""
+        with mock.patch('agents.validator_agent._current_year', return_value=2026):
+            self.assertEqual(FieldValidator.validate_date('01/01/2027')['reason'], 'future_date')
+        with mock.patch('agents.validator_agent._current_year', return_value=2027):
+            self.assertTrue(FieldValidator.validate_date('01/01/2027')['valid'])
+    
+    def test_aadhaar_checksum(self):
+        """Test Verhoeff checksum validation of Aadhaar numbers"""
+        self.assertTrue(FieldValidator._validate_aadhaar_checksum('499118665246'))
+        
+        # Changing the check digit or swapping adjacent digits breaks the checksum
+        self.assertFalse(FieldValidator._validate_aadhaar_checksum('499118665247'))
+        self.assertFalse(FieldValidator._validate_aadhaar_checksum('491918665246'))
+        self.assertFalse(FieldValidator._validate_aadhaar_checksum('000000000000'))
+        self.assertFalse(FieldValidator._validate_aadhaar_checksum('49911866524'))
+    
+    def test_field_validators_do_not_compile_patterns(self):
+        """Test that warmed-up field validators only use patterns compiled at import"""
+        # Warm up once so strptime builds its per-format regexes
+        FieldValidator.validate_date('01/01/2000')
+        FieldValidator.validate_date('01-01-00')
+        FieldValidator.validate_date('2000-01-01')
+        
+        with mock.patch('re._compile', side_effect=AssertionError('pattern compiled per call')):
+            FieldValidator.validate_aadhaar_number('4991 1866 5246')
+            FieldValidator.validate_aadhaar_number('1234XXXX9012')
+            FieldValidator.validate_pan_number('BNZPM2501F')
+            FieldValidator.validate_name('Ravi K. Sharma')
+            FieldValidator.validate_date('15/08/1991')
+            FieldValidator.validate_date('15-08-91')
+            FieldValidator.validate_date('1991-08-15')
+            FieldValidator.validate_gender('Female')
+            FieldValidator.validate_address('House No 12, Sector 4, Gurgaon, Haryana 122001')
+    
+    def test_duplicate_names_validated_once(self):
+        """Test that a Father's Name equal to the Name reuses the cached validation"""
+        FieldValidator.validate_name.cache_clear()
+        fields = {
+            'document_type': 'PAN',
+            'PAN Number': 'BNZPM2501F',
+            'Name': 'Robert Smith',
+            'Father\'s Name': 'Robert Smith'
+        }
+        
+        result = self.validator.validate({'status': 'success', 'extracted_data': fields})
+        details = result['validation_details']
+        
+        info = FieldValidator.validate_name.cache_info()
+        self.assertEqual((info.misses, info.hits), (1, 1))
+        # Each field still gets its own result dict
+        self.assertEqual(details['Name'], details['Father\'s Name'])
+        self.assertIsNot(details['Name'], details['Father\'s Name'])
+    
+    def test_validate_many_keeps_order(self):
+        """Test batch validation returns one result per input, in order"""
+        batch = [
+            {'status': 'success', 'extracted_data': {'document_type': 'PAN', 'PAN Number': 'BNZPM2501F', 'Name': 'Jane Smith'}},
+            {'status': 'error', 'error_message': 'OCR failed'},
+            {'status': 'success', 'extracted_data': {'document_type': 'AADHAAR', 'Aadhaar Number': '499118665246', 'Name': 'John Doe'}}
+        ]
+        
+        results = self.validator.validate_many(batch)
+        self.assertEqual([r.get('document_type') for r in results], ['PAN', None, 'AADHAAR'])
+        self.assertEqual(results[1]['validation_status'], 'failed')
+    
     def test_validate_aadhaar_number_format(self):
         """Test Aadhaar number format validation"""
         # Valid formats
@@ -11,13 +11,22 @@ import sqlite3
 import os
 from datetime import datetime
 
+try:
+    import fitz  # PyMuPDF
+except ImportError:
+    fitz = None
+
+# Text-layer extractions shorter than this are treated as scanned pages and OCRed
+TEXT_LAYER_MIN_CHARS = 50
+
 class PDFExtractorTool(BaseTool):
     name = "PDFExtractorTool"
     description = "Extracts fields from ID documents (Aadhaar/PAN) and stores them in database with dynamic table creation"
 
-    def __init__(self, db_path: str = "documents.db"):
+    def __init__(self, db_path: str = "documents.db", backend: str = "pymupdf"):
         super().__init__()
         self.db_path = db_path
+        self.backend = backend
         self.db_agent = None  # Initialize lazily to avoid circular import
         self._init_database()
 
@@ -103,6 +112,24 @@ class PDFExtractorTool(BaseTool):
 
     def _extract_text_from_pdf(self, pdf_path: str) -> str:
         """Extract text from PDF with preprocessing"""
+        if self.backend == "pymupdf" and fitz is not None:
+            text = self._extract_text_layer(pdf_path)
+            if len(text.strip()) >= TEXT_LAYER_MIN_CHARS:
+                return text
+        
+        return self._extract_text_with_ocr(pdf_path)
+    
+    def _extract_text_layer(self, pdf_path: str) -> str:
+        """Read the embedded text layer with PyMuPDF, skipping rasterization and OCR"""
+        try:
+            with fitz.open(pdf_path) as document:
+                return "".join(self._clean_text(page.get_text()) + "\n" for page in document)
+        except Exception as e:
+            print(f"Error reading PDF text layer: {e}")
+            return ""
+    
+    def _extract_text_with_ocr(self, pdf_path: str) -> str:
+        """Rasterize each page and OCR it; used for scanned PDFs without a text layer"""
         try:
             pages = convert_from_path(pdf_path, dpi=300)
         except Exception as e:
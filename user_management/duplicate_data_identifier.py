@@ -5,6 +5,7 @@ Scans existing databases for duplicate records and generates detailed reports
 """
 
 import sqlite3
+import re
 import json
 import csv
 from datetime import datetime
@@ -13,6 +14,10 @@ from pathlib import Path
 import logging
 import argparse
 
+# Normalization patterns, compiled once for the per-record dedup loops
+AADHAAR_STRIP_RE = re.compile(r'[^\dX]')
+PAN_STRIP_RE = re.compile(r'[^A-Z0-9]')
+
 class DuplicateDataIdentifier:
     """Identifies and reports duplicate data across databases"""
     
@@ -55,15 +60,13 @@ class DuplicateDataIdentifier:
         """Normalize Aadhaar number for comparison"""
         if not aadhaar:
             return ""
-        import re
-        return re.sub(r'[^\dX]', '', str(aadhaar).upper())
+        return AADHAAR_STRIP_RE.sub('', str(aadhaar).upper())
     
     def normalize_pan(self, pan: str) -> str:
         """Normalize PAN number for comparison"""
         if not pan:
             return ""
-        import re
-        return re.sub(r'[^A-Z0-9]', '', str(pan).upper())
+        return PAN_STRIP_RE.sub('', str(pan).upper())
     
     def check_database_exists(self, db_path: str) -> bool:
         """Check if database file exists and is accessible"""
@@ -6,10 +6,55 @@ Prevents duplicate document entries across all databases
 
 import sqlite3
 import re
+import threading
 from typing import Dict, List, Optional, Tuple
 from datetime import datetime
 import logging
 
+# Normalization and format patterns, compiled once for every lookup
+AADHAAR_STRIP_RE = re.compile(r'[^\dX]')
+PAN_STRIP_RE = re.compile(r'[^A-Z0-9]')
+PAN_FORMAT_RE = re.compile(r'^[A-Z]{5}[0-9]{4}[A-Z]$')
+
+# Per-thread read connections for the hot duplicate lookups
+_thread_connections = threading.local()
+
+_CONNECTION_PRAGMAS = """
+    PRAGMA journal_mode=WAL;
+    PRAGMA synchronous=NORMAL;
+    PRAGMA temp_store=MEMORY;
+    PRAGMA mmap_size=268435456;
+"""
+
+AADHAAR_EXISTS_SQL = '''
+    SELECT ef.id, ef.document_id, ef."Aadhaar Number", ef."Name", 
+           ad.file_path, ad.created_at
+    FROM extracted_fields ef
+    JOIN aadhaar_documents ad ON ef.document_id = ad.id
+    WHERE ef."Aadhaar Number" = ?
+'''
+
+PAN_EXISTS_SQL = '''
+    SELECT ef.id, ef.document_id, ef."PAN Number", ef."Name", 
+           pd.file_path, pd.created_at
+    FROM extracted_fields ef
+    JOIN pan_documents pd ON ef.document_id = pd.id
+    WHERE ef."PAN Number" = ?
+'''
+
+def get_thread_connection(db_path: str) -> sqlite3.Connection:
+    """Return this thread's connection to db_path, opening and tuning it on first use"""
+    connections = getattr(_thread_connections, 'by_path', None)
+    if connections is None:
+        connections = _thread_connections.by_path = {}
+    
+    conn = connections.get(db_path)
+    if conn is None:
+        conn = sqlite3.connect(db_path, isolation_level=None)
+        conn.executescript(_CONNECTION_PRAGMAS)
+        connections[db_path] = conn
+    return conn
+
 class DuplicatePreventionService:
     """Prevents duplicate document entries across all tables"""
     
@@ -40,7 +85,7 @@ class DuplicatePreventionService:
             return ""
         
         # Remove all non-digit characters except X (for masked Aadhaar)
-        normalized = re.sub(r'[^\dX]', '', str(aadhaar_number).upper())
+        normalized = AADHAAR_STRIP_RE.sub('', str(aadhaar_number).upper())
         
         # Validate length (should be 12 characters)
         if len(normalized) != 12:
@@ -54,12 +99,12 @@ class DuplicatePreventionService:
             return ""
         
         # Remove all non-alphanumeric characters and convert to uppercase
-        normalized = re.sub(r'[^A-Z0-9]', '', str(pan_number).upper())
+        normalized = PAN_STRIP_RE.sub('', str(pan_number).upper())
         
         # Validate PAN format (5 letters + 4 digits + 1 letter)
         if len(normalized) != 10:
             self.logger.warning(f"Invalid PAN length: {len(normalized)} for {pan_number}")
-        elif not re.match(r'^[A-Z]{5}[0-9]{4}[A-Z]$', normalized):
+        elif not PAN_FORMAT_RE.match(normalized):
             self.logger.warning(f"Invalid PAN format: {normalized}")
         
         return normalized
@@ -72,32 +117,23 @@ class DuplicatePreventionService:
         normalized_aadhaar = self.normalize_aadhaar(aadhaar_number)
         
         try:
-            with sqlite3.connect(self.aadhaar_db_path) as conn:
-                cursor = conn.cursor()
-                
-                # Check in extracted_fields table
-                cursor.execute('''
-                    SELECT ef.id, ef.document_id, ef."Aadhaar Number", ef."Name", 
-                           ad.file_path, ad.created_at
-                    FROM extracted_fields ef
-                    JOIN aadhaar_documents ad ON ef.document_id = ad.id
-                    WHERE ef."Aadhaar Number" = ?
-                ''', (normalized_aadhaar,))
-                
-                row = cursor.fetchone()
-                if row:
-                    return {
-                        'exists': True,
-                        'field_id': row[0],
-                        'document_id': row[1],
-                        'aadhaar_number': row[2],
-                        'name': row[3],
-                        'file_path': row[4],
-                        'created_at': row[5],
-                        'database': 'aadhaar',
-                        'table': 'extracted_fields'
-                    }
-                
+            conn = get_thread_connection(self.aadhaar_db_path)
+            
+            # Check in extracted_fields table
+            row = conn.execute(AADHAAR_EXISTS_SQL, (normalized_aadhaar,)).fetchone()
+            if row:
+                return {
+                    'exists': True,
+                    'field_id': row[0],
+                    'document_id': row[1],
+                    'aadhaar_number': row[2],
+                    'name': row[3],
+                    'file_path': row[4],
+                    'created_at': row[5],
+                    'database': 'aadhaar',
+                    'table': 'extracted_fields'
+                }
+        
         except Exception as e:
             self.logger.error(f"Error checking Aadhaar existence: {e}")
         
@@ -111,32 +147,23 @@ class DuplicatePreventionService:
         normalized_pan = self.normalize_pan(pan_number)
         
         try:
-            with sqlite3.connect(self.pan_db_path) as conn:
-                cursor = conn.cursor()
-                
-                # Check in extracted_fields table
-                cursor.execute('''
-                    SELECT ef.id, ef.document_id, ef."PAN Number", ef."Name", 
-                           pd.file_path, pd.created_at
-                    FROM extracted_fields ef
-                    JOIN pan_documents pd ON ef.document_id = pd.id
-                    WHERE ef."PAN Number" = ?
-                ''', (normalized_pan,))
-                
-                row = cursor.fetchone()
-                if row:
-                    return {
-                        'exists': True,
-                        'field_id': row[0],
-                        'document_id': row[1],
-                        'pan_number': row[2],
-                        'name': row[3],
-                        'file_path': row[4],
-                        'created_at': row[5],
-                        'database': 'pan',
-                        'table': 'extracted_fields'
-                    }
-                
+            conn = get_thread_connection(self.pan_db_path)
+            
+            # Check in extracted_fields table
+            row = conn.execute(PAN_EXISTS_SQL, (normalized_pan,)).fetchone()
+            if row:
+                return {
+                    'exists': True,
+                    'field_id': row[0],
+                    'document_id': row[1],
+                    'pan_number': row[2],
+                    'name': row[3],
+                    'file_path': row[4],
+                    'created_at': row[5],
+                    'database': 'pan',
+                    'table': 'extracted_fields'
+                }
+        
         except Exception as e:
             self.logger.error(f"Error checking PAN existence: {e}")
         
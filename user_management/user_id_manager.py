@@ -13,6 +13,9 @@ import logging
 import hashlib
 import re
 
+# Removes everything except digits and the X used in masked Aadhaar numbers
+AADHAAR_STRIP_RE = re.compile(r'[^\dX]')
+
 class UserIDManager:
     """Manages unique user ID generation and assignment"""
     
@@ -68,7 +71,7 @@ class UserIDManager:
             return ""
         
         # Remove all non-digit characters except X (for masked Aadhaar)
-        normalized = re.sub(r'[^\dX]', '', str(aadhaar_number).upper())
+        normalized = AADHAAR_STRIP_RE.sub('', str(aadhaar_number).upper())
         return normalized
     
     def generate_user_id(self) -> str:
@@ -1,4 +1,5 @@
 from .logging_config import setup_logging
 from .file_utils import FileUtils
+from .time_utils import iso_now
 
-__all__ = ['setup_logging', 'FileUtils']
+__all__ = ['setup_logging', 'FileUtils', 'iso_now']
@@ -0,0 +1,15 @@
+import time
+from datetime import datetime
+
+# (whole second, ISO timestamp) of the last formatted time
+_cached_timestamp = (0, "")
+
+def iso_now() -> str:
+    """Return the current local time in ISO format, formatted at most once per second"""
+    global _cached_timestamp
+    second = int(time.time())
+    cached_second, timestamp = _cached_timestamp
+    if second != cached_second:
+        timestamp = datetime.fromtimestamp(second).isoformat()
+        _cached_timestamp = (second, timestamp)
+    return timestamp